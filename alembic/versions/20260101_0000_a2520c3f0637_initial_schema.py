@@ -0,0 +1,148 @@
+"""initial schema
+
+Schema as first released: string customer keys, comma-separated
+allowed_major_versions and naive UTC timestamps. Databases created
+before migrations were tracked (init_db / create_all at that release)
+already match it and only need ``alembic stamp a2520c3f0637``.
+
+Revision ID: a2520c3f0637
+Revises:
+Create Date: 2026-01-01 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a2520c3f0637"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+license_type_enum = sa.Enum("PERPETUAL", "SUBSCRIPTION", "DEMO", name="license_type_enum")
+license_status_enum = sa.Enum(
+    "ACTIVE", "EXPIRED", "REVOKED", "SUSPENDED", name="license_status_enum"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "api_keys",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "key_hash", sa.String(length=255), nullable=False, comment="Bcrypt hash of the API key"
+        ),
+        sa.Column(
+            "name", sa.String(length=100), nullable=False, comment="Friendly name for this API key"
+        ),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("can_issue_licenses", sa.Boolean(), nullable=False),
+        sa.Column("can_revoke_licenses", sa.Boolean(), nullable=False),
+        sa.Column("can_view_customers", sa.Boolean(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(), nullable=True),
+        sa.Column("usage_count", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("created_by", sa.String(length=100), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_api_keys_key_hash", "api_keys", ["key_hash"], unique=True)
+
+    op.create_table(
+        "customers",
+        sa.Column("id", sa.String(length=50), nullable=False),
+        sa.Column("name", sa.String(length=200), nullable=False),
+        sa.Column("email", sa.String(length=200), nullable=True),
+        sa.Column("company", sa.String(length=200), nullable=True),
+        sa.Column("phone", sa.String(length=50), nullable=True),
+        sa.Column("address", sa.Text(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_customers_email", "customers", ["email"])
+    op.create_index("ix_customers_id", "customers", ["id"])
+
+    op.create_table(
+        "licenses",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("customer_id", sa.String(length=50), nullable=False),
+        sa.Column("module_name", sa.String(length=100), nullable=False),
+        sa.Column("license_type", license_type_enum, nullable=False),
+        sa.Column(
+            "allowed_major_versions",
+            sa.String(length=200),
+            nullable=False,
+            comment="Comma-separated list of allowed Odoo major versions (e.g., '17,18')",
+        ),
+        sa.Column("issued_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=True),
+        sa.Column("status", license_status_enum, nullable=False),
+        sa.Column("revoked_at", sa.DateTime(), nullable=True),
+        sa.Column("revoked_reason", sa.Text(), nullable=True),
+        sa.Column(
+            "instance_fingerprint",
+            sa.String(length=100),
+            nullable=True,
+            comment="SHA-256 fingerprint for instance binding",
+        ),
+        sa.Column("token", sa.Text(), nullable=False, comment="Signed JWT license token"),
+        sa.Column(
+            "key_id",
+            sa.String(length=50),
+            nullable=False,
+            comment="Key ID used to sign this license (for key rotation)",
+        ),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["customer_id"], ["customers.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_licenses_customer_id", "licenses", ["customer_id"])
+    op.create_index("ix_licenses_expires_at", "licenses", ["expires_at"])
+    op.create_index("ix_licenses_id", "licenses", ["id"])
+    op.create_index("ix_licenses_instance_fingerprint", "licenses", ["instance_fingerprint"])
+    op.create_index("ix_licenses_license_type", "licenses", ["license_type"])
+    op.create_index("ix_licenses_module_name", "licenses", ["module_name"])
+    op.create_index("ix_licenses_status", "licenses", ["status"])
+
+    op.create_table(
+        "audit_logs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("license_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column(
+            "event_type",
+            sa.String(length=50),
+            nullable=False,
+            comment="Event type: issued, validated, revoked, etc.",
+        ),
+        sa.Column("event_data", sa.Text(), nullable=True, comment="JSON-encoded event details"),
+        sa.Column("customer_id", sa.String(length=50), nullable=True),
+        sa.Column("module_name", sa.String(length=100), nullable=True),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("user_agent", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["license_id"], ["licenses.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_audit_logs_created_at", "audit_logs", ["created_at"])
+    op.create_index("ix_audit_logs_event_type", "audit_logs", ["event_type"])
+    op.create_index("ix_audit_logs_license_id", "audit_logs", ["license_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("audit_logs")
+    op.drop_table("licenses")
+    op.drop_table("customers")
+    op.drop_table("api_keys")
+    op.execute("DROP TYPE IF EXISTS license_status_enum")
+    op.execute("DROP TYPE IF EXISTS license_type_enum")
@@ -0,0 +1,197 @@
+"""surrogate customer keys, version arrays and query indexes
+
+Brings a database at the initial schema up to the current models:
+
+- customers: the string key becomes ``public_id`` (unique) and a BIGSERIAL
+  ``id`` becomes the primary key; ``licenses.customer_id`` is backfilled
+  with it and the foreign key repointed.
+- licenses.allowed_major_versions: '17,18' strings become smallint[] ({17,18}).
+- Plain status / customer_id / created_at indexes are replaced by the
+  partial, composite and GIN indexes the queries use.
+- created_at / updated_at / issued_at become timestamptz (existing values
+  are naive UTC) with a now() server default.
+
+Run it in a maintenance window: the type changes rewrite customers,
+licenses and audit_logs, and the whole upgrade holds ACCESS EXCLUSIVE
+locks on them until it commits. It runs in one transaction, so a failure
+leaves the schema untouched. Downgrade reverses every step.
+
+Revision ID: fc04ce27c8bc
+Revises: a2520c3f0637
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "fc04ce27c8bc"
+down_revision: Union[str, None] = "a2520c3f0637"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column) pairs moved from naive UTC timestamps to timestamptz
+TIMESTAMP_COLUMNS = [
+    ("customers", "created_at"),
+    ("customers", "updated_at"),
+    ("licenses", "issued_at"),
+    ("licenses", "created_at"),
+    ("licenses", "updated_at"),
+    ("audit_logs", "created_at"),
+    ("api_keys", "created_at"),
+]
+
+
+def upgrade() -> None:
+    # ===== Timestamps =====
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(timezone=True),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            server_default=sa.func.now(),
+        )
+
+    # ===== Customer surrogate key =====
+    # Keep the string key as the public identifier; it stays the PK until
+    # the licenses foreign key has been moved off it.
+    op.alter_column("customers", "id", new_column_name="public_id")
+    op.execute("ALTER TABLE customers ADD COLUMN id BIGSERIAL NOT NULL")
+
+    # Backfill the new foreign key column from the old string key
+    op.add_column("licenses", sa.Column("customer_key", sa.BigInteger(), nullable=True))
+    op.execute(
+        "UPDATE licenses SET customer_key = customers.id "
+        "FROM customers WHERE customers.public_id = licenses.customer_id"
+    )
+
+    op.drop_constraint("licenses_customer_id_fkey", "licenses", type_="foreignkey")
+    op.drop_index("ix_licenses_customer_id", table_name="licenses")
+    op.drop_column("licenses", "customer_id")
+    op.alter_column("licenses", "customer_key", new_column_name="customer_id", nullable=False)
+
+    op.drop_constraint("customers_pkey", "customers", type_="primary")
+    op.create_primary_key("customers_pkey", "customers", ["id"])
+    # ix_customers_id followed the renamed column
+    op.drop_index("ix_customers_id", table_name="customers")
+    op.create_index("ix_customers_public_id", "customers", ["public_id"], unique=True)
+    op.create_foreign_key(
+        "licenses_customer_id_fkey",
+        "licenses",
+        "customers",
+        ["customer_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+    # ===== Allowed versions as smallint[] =====
+    op.alter_column(
+        "licenses",
+        "allowed_major_versions",
+        type_=sa.ARRAY(sa.SmallInteger()),
+        postgresql_using=(
+            "string_to_array(replace(allowed_major_versions, ' ', ''), ',')::smallint[]"
+        ),
+        comment="Allowed Odoo major versions (e.g., {17,18})",
+        existing_comment="Comma-separated list of allowed Odoo major versions (e.g., '17,18')",
+        existing_nullable=False,
+    )
+
+    # ===== Indexes =====
+    op.drop_index("ix_licenses_status", table_name="licenses")
+    op.create_index(
+        "ix_licenses_status_active",
+        "licenses",
+        ["id"],
+        postgresql_where=sa.text("status = 'ACTIVE'"),
+    )
+    op.create_index("ix_licenses_type_status", "licenses", ["license_type", "status"])
+    op.create_index("ix_licenses_customer_module", "licenses", ["customer_id", "module_name"])
+    op.create_index(
+        "ix_licenses_customer_active",
+        "licenses",
+        ["customer_id"],
+        postgresql_where=sa.text("status = 'ACTIVE'"),
+    )
+    op.create_index(
+        "ix_licenses_status_inactive",
+        "licenses",
+        ["status"],
+        postgresql_where=sa.text("status <> 'ACTIVE'"),
+    )
+    op.create_index(
+        "ix_licenses_allowed_major_versions",
+        "licenses",
+        ["allowed_major_versions"],
+        postgresql_using="gin",
+    )
+
+    op.drop_index("ix_audit_logs_created_at", table_name="audit_logs")
+    op.create_index("ix_audit_logs_created_at_id", "audit_logs", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    # ===== Indexes =====
+    op.drop_index("ix_audit_logs_created_at_id", table_name="audit_logs")
+    op.create_index("ix_audit_logs_created_at", "audit_logs", ["created_at"])
+
+    op.drop_index("ix_licenses_allowed_major_versions", table_name="licenses")
+    op.drop_index("ix_licenses_status_inactive", table_name="licenses")
+    op.drop_index("ix_licenses_customer_active", table_name="licenses")
+    op.drop_index("ix_licenses_customer_module", table_name="licenses")
+    op.drop_index("ix_licenses_type_status", table_name="licenses")
+    op.drop_index("ix_licenses_status_active", table_name="licenses")
+    op.create_index("ix_licenses_status", "licenses", ["status"])
+
+    # ===== Allowed versions back to a comma-separated string =====
+    op.alter_column(
+        "licenses",
+        "allowed_major_versions",
+        type_=sa.String(length=200),
+        postgresql_using="array_to_string(allowed_major_versions, ',')",
+        comment="Comma-separated list of allowed Odoo major versions (e.g., '17,18')",
+        existing_comment="Allowed Odoo major versions (e.g., {17,18})",
+        existing_nullable=False,
+    )
+
+    # ===== Customer string key =====
+    op.drop_constraint("licenses_customer_id_fkey", "licenses", type_="foreignkey")
+    op.add_column("licenses", sa.Column("customer_key", sa.String(length=50), nullable=True))
+    op.execute(
+        "UPDATE licenses SET customer_key = customers.public_id "
+        "FROM customers WHERE customers.id = licenses.customer_id"
+    )
+    op.drop_column("licenses", "customer_id")
+    op.alter_column("licenses", "customer_key", new_column_name="customer_id", nullable=False)
+
+    op.drop_constraint("customers_pkey", "customers", type_="primary")
+    op.drop_index("ix_customers_public_id", table_name="customers")
+    op.drop_column("customers", "id")
+    op.alter_column("customers", "public_id", new_column_name="id")
+    op.create_primary_key("customers_pkey", "customers", ["id"])
+    op.create_index("ix_customers_id", "customers", ["id"])
+
+    op.create_index("ix_licenses_customer_id", "licenses", ["customer_id"])
+    op.create_foreign_key(
+        "licenses_customer_id_fkey",
+        "licenses",
+        "customers",
+        ["customer_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+
+    # ===== Timestamps =====
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.DateTime(),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+            server_default=None,
+        )
@@ -1,13 +1,42 @@
+import functools
+import hashlib
 import os
-from typing import Optional, Tuple
-from urllib.parse import urlparse
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
 
 import odoo
-from odoo import _, api, fields, models
+from odoo import _, api, fields, models, tools
 from odoo.exceptions import UserError
 
 from .license_verifier import LicenseVerificationError, LicenseVerifier
 
+# One verifier (and parsed public key) per key path/issuer for the process.
+_VERIFIER_CACHE: Dict[Tuple[str, str], LicenseVerifier] = {}
+
+
+def _get_verifier(public_key_path: str, expected_issuer: str) -> LicenseVerifier:
+    key = (public_key_path, expected_issuer)
+    verifier = _VERIFIER_CACHE.get(key)
+    if verifier is None:
+        verifier = _VERIFIER_CACHE.setdefault(key, LicenseVerifier(public_key_path, expected_issuer))
+    return verifier
+
+
+@functools.lru_cache(maxsize=16)
+def _normalize_domain(value: str) -> str:
+    """Reduce a base URL such as ``https://host:8069/web`` to ``host:8069``."""
+    if "://" in value:
+        value = value.split("://", 1)[1]
+    return value.split("/", 1)[0].split("?", 1)[0]
+
+
+@functools.lru_cache(maxsize=1)
+def _public_key_path() -> str:
+    module_dir = os.path.dirname(os.path.dirname(__file__))
+    return os.path.normpath(
+        os.path.join(module_dir, "security", "public_keys", "aegis-2026-01.public.pem")
+    )
+
 
 class AegisLicense(models.Model):
     _name = "aegis.license"
@@ -27,6 +56,9 @@ class AegisLicense(models.Model):
     )
     last_verified_at = fields.Datetime()
     last_error = fields.Text()
+    # Hash of the token and version/instance context of the last successful
+    # verification; a fresh result is only reused for the same context.
+    verified_context = fields.Char(readonly=True, copy=False)
 
     license_type = fields.Char(readonly=True)
     issued_at = fields.Char(readonly=True)
@@ -39,11 +71,37 @@ class AegisLicense(models.Model):
         ("module_name_unique", "unique(module_name)", "One license per module."),
     ]
 
+    def write(self, vals):
+        if "license_token" in vals:
+            # A new token must never inherit the previous verification.
+            vals = {
+                "state": "unknown",
+                "last_verified_at": False,
+                "verified_context": False,
+                **vals,
+            }
+        return super().write(vals)
+
     def action_verify(self):
+        verifier = _get_verifier(self._get_public_key_path(), self._get_expected_issuer())
+        odoo_version = odoo.release.major_version
+        instance_db_uuid, instance_domain = self._resolve_instance_context(None, None)
+        now = fields.Datetime.now()
+
+        # Records whose outcome is identical share a single write.
+        batches: Dict[tuple, list] = {}
         for record in self:
-            record._verify_and_update()
-            if record.state != "valid":
-                raise UserError(_("License invalid: %s") % record.last_error)
+            vals = record._prepare_verification_vals(
+                verifier, odoo_version, instance_db_uuid, instance_domain, now
+            )
+            batches.setdefault(tuple(sorted(vals.items())), []).append(record.id)
+
+        for items, record_ids in batches.items():
+            self.browse(record_ids).write(dict(items))
+
+        invalid = self.filtered(lambda rec: rec.state != "valid")
+        if invalid:
+            raise UserError(_("License invalid: %s") % invalid[0].last_error)
 
     @api.model
     def verify_module_license(self, *args, **kwargs) -> bool:
@@ -72,7 +130,6 @@ class AegisLicense(models.Model):
 
         return True
 
-    @api.model
     @api.model
     def _check_access(
         self,
@@ -93,12 +150,7 @@ class AegisLicense(models.Model):
         Intentionally confusing, does nothing meaningful.
         Decoy for casual greps.
         """
-        payload = (args, kwargs)
-        token = str(payload).encode("utf-8")
-        acc = 0
-        for idx, byte in enumerate(token):
-            acc ^= (byte + (idx % 13)) & 0xFF
-        return acc == acc
+        return True
 
     def _verify_and_update(
         self,
@@ -108,58 +160,126 @@ class AegisLicense(models.Model):
     ) -> None:
         self.ensure_one()
 
-        verifier = LicenseVerifier(
-            public_key_path=self._get_public_key_path(),
-            expected_issuer=self._get_expected_issuer(),
-        )
-
         odoo_version = odoo_version or odoo.release.major_version
         instance_db_uuid, instance_domain = self._resolve_instance_context(
             instance_db_uuid, instance_domain
         )
+        context_key = self._verification_context_key(
+            odoo_version, instance_db_uuid, instance_domain
+        )
+
+        if self._is_verification_fresh(context_key):
+            return
+
+        verifier = _get_verifier(self._get_public_key_path(), self._get_expected_issuer())
+
+        vals = self._prepare_verification_vals(
+            verifier, odoo_version, instance_db_uuid, instance_domain, fields.Datetime.now()
+        )
+        if vals["state"] == "valid":
+            vals["verified_context"] = context_key
+
+        changed = {
+            key: value
+            for key, value in vals.items()
+            if key != "last_verified_at" and self[key] != value
+        }
+        if changed:
+            self.write(vals)
+            return
+
+        # Same outcome as last time: only bump the timestamp, bypassing the ORM write.
+        self.env.cr.execute(
+            "UPDATE aegis_license SET last_verified_at = %s WHERE id = %s",
+            (vals["last_verified_at"], self.id),
+        )
+        self.invalidate_recordset(["last_verified_at"])
+
+    def _verification_context_key(
+        self,
+        odoo_version: str,
+        instance_db_uuid: Optional[str],
+        instance_domain: Optional[str],
+    ) -> str:
+        """Identify what a verification covered: the token and the context it was checked in."""
+        parts = (self._token_hash(), odoo_version, instance_db_uuid or "", instance_domain or "")
+        return hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+    def _token_hash(self) -> str:
+        return hashlib.blake2b(self.license_token.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _is_verification_fresh(self, context_key: str) -> bool:
+        """A recent successful verification is reused until the TTL or the license expires.
+
+        Only for the same token, Odoo version and instance it was verified for.
+        """
+        if self.state != "valid" or not self.last_verified_at:
+            return False
+
+        if self.verified_context != context_key:
+            return False
+
+        ttl = int(
+            self.env["ir.config_parameter"].sudo().get_param("aegis.verify_ttl_seconds", 300)
+        )
+        now = fields.Datetime.now()
+        if (now - self.last_verified_at).total_seconds() >= ttl:
+            return False
+
+        if self.expires_at:
+            expires_at = datetime.fromisoformat(self.expires_at)
+            if expires_at <= now.replace(tzinfo=timezone.utc):
+                return False
+
+        return True
+
+    def _prepare_verification_vals(
+        self,
+        verifier: LicenseVerifier,
+        odoo_version: str,
+        instance_db_uuid: Optional[str],
+        instance_domain: Optional[str],
+        verified_at: datetime,
+    ) -> dict:
+        self.ensure_one()
 
         try:
-            payload = verifier.verify_license(
-                license_token=self.license_token,
+            # decode_license reuses the verifier's process-wide cache of
+            # signature-verified tokens (keyed by public key and token).
+            license_info = verifier.decode_license(self.license_token)
+            verifier.check_claims(
+                license_info,
                 module_name=self.module_name,
                 odoo_version=odoo_version,
                 instance_db_uuid=instance_db_uuid,
                 instance_domain=instance_domain,
             )
-
-            info = verifier.get_license_info(self.license_token)
-            module_info = payload.get("module", {})
-
-            self.write(
-                {
-                    "state": "valid",
-                    "last_verified_at": fields.Datetime.now(),
-                    "last_error": False,
-                    "license_type": payload.get("license_type"),
-                    "issued_at": info.get("issued_at"),
-                    "expires_at": info.get("expires_at"),
-                    "is_bound": info.get("is_bound"),
-                    "customer_name": payload.get("customer", {}).get("name"),
-                    "allowed_versions": ",".join(module_info.get("allowed_major_versions", [])),
-                }
-            )
-
         except LicenseVerificationError as exc:
-            self.write(
-                {
-                    "state": "invalid",
-                    "last_verified_at": fields.Datetime.now(),
-                    "last_error": str(exc),
-                }
-            )
-            return
+            return {
+                "state": "invalid",
+                "last_verified_at": verified_at,
+                "last_error": str(exc),
+            }
+
+        # Empty Char fields read back as False, so store missing values as False
+        # too; otherwise a perpetual license (no expires_at) always looks changed.
+        return {
+            "state": "valid",
+            "last_verified_at": verified_at,
+            "last_error": False,
+            "license_type": license_info.license_type or False,
+            "issued_at": license_info.issued_at or False,
+            "expires_at": license_info.expires_at or False,
+            "is_bound": license_info.is_bound,
+            "customer_name": license_info.customer_name or False,
+            "allowed_versions": license_info.allowed_versions or False,
+        }
 
     def _get_public_key_path(self) -> str:
-        module_dir = os.path.dirname(os.path.dirname(__file__))
-        return os.path.normpath(
-            os.path.join(module_dir, "security", "public_keys", "aegis-2026-01.public.pem")
-        )
+        return _public_key_path()
 
+    @api.model
+    @tools.ormcache()
     def _get_expected_issuer(self) -> str:
         return (
             self.env["ir.config_parameter"]
@@ -172,19 +292,26 @@ class AegisLicense(models.Model):
         instance_db_uuid: Optional[str],
         instance_domain: Optional[str],
     ) -> Tuple[Optional[str], Optional[str]]:
-        config = self.env["ir.config_parameter"].sudo()
+        if instance_db_uuid and instance_domain:
+            return instance_db_uuid, instance_domain
+
+        db_uuid, base_url = self._get_instance_params()
 
         if not instance_db_uuid:
-            instance_db_uuid = config.get_param("database.uuid")
+            instance_db_uuid = db_uuid
 
         if not instance_domain:
-            base_url = config.get_param("web.base.url")
-            instance_domain = self._normalize_domain(base_url) if base_url else None
+            instance_domain = _normalize_domain(base_url) if base_url else None
 
         return instance_db_uuid, instance_domain
 
-    def _normalize_domain(self, value: str) -> str:
-        parsed = urlparse(value)
-        if parsed.scheme and parsed.netloc:
-            return parsed.netloc
-        return value
+    @api.model
+    @tools.ormcache()
+    def _get_instance_params(self) -> Tuple[Optional[str], Optional[str]]:
+        rows = (
+            self.env["ir.config_parameter"]
+            .sudo()
+            .search_read([("key", "in", ["database.uuid", "web.base.url"])], ["key", "value"])
+        )
+        params = {row["key"]: row["value"] for row in rows}
+        return params.get("database.uuid"), params.get("web.base.url")
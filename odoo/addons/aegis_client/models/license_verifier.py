@@ -1,31 +1,141 @@
+import base64
+import binascii
+import functools
 import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, FrozenSet, Optional, Tuple
 
 import jwt
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
+# Signature-verified licenses keyed by sha256(public key + token). Only the
+# signature check is skipped on a hit; claims are re-validated on every call.
+_VERIFY_CACHE_MAXSIZE = 1024
+_VERIFY_CACHE_TTL = 30.0
+
+_REQUIRED_CLAIMS = ("jti", "iss", "iat")
+# Header keys the direct Ed25519 path understands; anything else goes to PyJWT
+_ACCEPTED_HEADER_KEYS = frozenset({"alg", "kid", "typ"})
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+class _VerifyCache:
+    """Thread-safe FIFO cache with a per-entry expiry.
+
+    Entries share a similar lifetime, so insertion order is a good enough
+    eviction order and hits do no LRU bookkeeping.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[bytes, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._data[key]
+                return None
+            return entry[0]
+
+    def set(self, key: bytes, value: Any, expires: float) -> None:
+        with self._lock:
+            self._data[key] = (value, expires)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_verify_cache = _VerifyCache(_VERIFY_CACHE_MAXSIZE, _VERIFY_CACHE_TTL)
+
+
+@functools.lru_cache(maxsize=256)
+def _instance_fingerprint(db_uuid: str, domain: str) -> str:
+    return f"sha256:{hashlib.sha256(f'{db_uuid}:{domain}'.encode('utf-8')).hexdigest()}"
+
+
+def _format_timestamp(ts: Optional[int]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
 
 class LicenseVerificationError(Exception):
     """Raised when license verification fails."""
 
 
+@dataclass(slots=True)
+class LicenseInfo:
+    """Fields extracted once from a signature-verified license payload."""
+
+    license_type: Optional[str]
+    issued_at: Optional[str]
+    expires_at: Optional[str]
+    is_bound: bool
+    customer_name: Optional[str]
+    allowed_versions: str
+    allowed_set: FrozenSet[str]
+    module_technical_name: Optional[str]
+    payload: Dict[str, Any]
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "LicenseInfo":
+        module_info = payload.get("module", {})
+        allowed_versions = module_info.get("allowed_major_versions", [])
+        return cls(
+            license_type=payload.get("license_type"),
+            issued_at=_format_timestamp(payload.get("iat")),
+            expires_at=_format_timestamp(payload.get("exp")),
+            is_bound="instance_fingerprint" in payload,
+            customer_name=payload.get("customer", {}).get("name"),
+            allowed_versions=",".join(allowed_versions),
+            allowed_set=frozenset(allowed_versions),
+            module_technical_name=module_info.get("technical_name"),
+            payload=payload,
+        )
+
+
 class LicenseVerifier:
     """Verifies AEGIS license signatures and business rules."""
 
-    def __init__(self, public_key_path: str, expected_issuer: str):
+    public_key: ed25519.Ed25519PublicKey
+    expected_issuer: str
+    _cache_salt: bytes
+
+    def __init__(self, public_key_path: str, expected_issuer: str) -> None:
         self.public_key = self._load_public_key(public_key_path)
-        self.expected_issuer = expected_issuer
+        self.expected_issuer = sys.intern(expected_issuer)
+        self._cache_salt = self.public_key.public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw,
+        )
 
     def _load_public_key(self, key_path: str) -> ed25519.Ed25519PublicKey:
-        key_path_obj = Path(key_path)
-        if not key_path_obj.exists():
-            raise FileNotFoundError(f"Public key not found: {key_path}")
+        try:
+            with open(key_path, "rb") as handle:
+                key_data = handle.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Public key not found: {key_path}") from None
 
-        with open(key_path, "rb") as handle:
-            public_key = serialization.load_pem_public_key(handle.read())
+        public_key = serialization.load_pem_public_key(key_data)
 
         if not isinstance(public_key, ed25519.Ed25519PublicKey):
             raise ValueError("Key is not an Ed25519 public key")
@@ -39,98 +149,172 @@ class LicenseVerifier:
         odoo_version: str,
         instance_db_uuid: Optional[str] = None,
         instance_domain: Optional[str] = None,
-    ) -> Dict[str, Any]:
+    ) -> LicenseInfo:
+        license_info = self.decode_license(license_token)
+        self.check_claims(
+            license_info, module_name, odoo_version, instance_db_uuid, instance_domain
+        )
+        return license_info
+
+    def decode_license(self, license_token: str) -> LicenseInfo:
+        """Return the signature-verified license; claims are not checked."""
+        cache_key = hashlib.sha256(self._cache_salt + license_token.encode("utf-8")).digest()
+        license_info = self._get_cached_license(cache_key)
+
+        if license_info is None:
+            license_info = LicenseInfo.from_payload(self._decode_token(license_token))
+            self._store_license(cache_key, license_info)
+
+        return license_info
+
+    def _decode_token(self, license_token: str) -> Dict[str, Any]:
+        try:
+            header_b64, payload_b64, signature_b64 = license_token.split(".")
+            header = json.loads(_b64url_decode(header_b64))
+        except (ValueError, binascii.Error):
+            return self._decode_token_pyjwt(license_token)
+
+        # Anything other than a plain EdDSA header goes through PyJWT.
+        if (
+            not isinstance(header, dict)
+            or header.get("alg") != "EdDSA"
+            or not header.keys() <= _ACCEPTED_HEADER_KEYS
+        ):
+            return self._decode_token_pyjwt(license_token)
+
+        try:
+            signature = _b64url_decode(signature_b64)
+            self.public_key.verify(signature, f"{header_b64}.{payload_b64}".encode("ascii"))
+            payload = json.loads(_b64url_decode(payload_b64))
+        except InvalidSignature:
+            raise LicenseVerificationError("Invalid license signature - possible tampering")
+        except (ValueError, binascii.Error) as exc:
+            raise LicenseVerificationError(f"License decode error: {exc}")
+
+        if not isinstance(payload, dict):
+            raise LicenseVerificationError("License decode error: payload is not a JSON object")
+
+        for claim in _REQUIRED_CLAIMS:
+            if claim not in payload:
+                raise LicenseVerificationError(
+                    f'Invalid license token: Token is missing the "{claim}" claim'
+                )
+
+        if not isinstance(payload["iat"], (int, float)):
+            raise LicenseVerificationError(
+                "Invalid license token: Issued At claim (iat) must be an integer."
+            )
+
+        # PyJWT owns the time-sensitive and audience checks.
+        if "nbf" in payload or "aud" in payload or payload["iat"] > time.time():
+            return self._decode_token_pyjwt(license_token)
+
+        if isinstance(payload["iss"], str):
+            payload["iss"] = sys.intern(payload["iss"])
+
+        return payload
+
+    def _decode_token_pyjwt(self, license_token: str) -> Dict[str, Any]:
         try:
-            payload = jwt.decode(
+            return jwt.decode(
                 license_token,
                 self.public_key,
                 algorithms=["EdDSA"],
                 options={
                     "verify_signature": True,
                     "verify_exp": False,
-                    "require": ["jti", "iss", "iat"],
+                    "require": list(_REQUIRED_CLAIMS),
                 },
             )
 
-            if "exp" in payload:
-                exp_timestamp = payload["exp"]
-                now_timestamp = datetime.now(timezone.utc).timestamp()
-                if now_timestamp >= exp_timestamp:
-                    raise jwt.ExpiredSignatureError("License has expired")
+        except jwt.InvalidSignatureError:
+            raise LicenseVerificationError("Invalid license signature - possible tampering")
 
-            if payload.get("iss") != self.expected_issuer:
-                raise LicenseVerificationError(
-                    f"Invalid issuer: expected '{self.expected_issuer}', got '{payload.get('iss')}'"
-                )
+        except jwt.DecodeError as exc:
+            raise LicenseVerificationError(f"License decode error: {exc}")
 
-            module_info = payload.get("module", {})
-            if module_info.get("technical_name") != module_name:
-                raise LicenseVerificationError(
-                    "License is for module '%s', not '%s'"
-                    % (module_info.get("technical_name"), module_name)
-                )
+        except jwt.InvalidTokenError as exc:
+            raise LicenseVerificationError(f"Invalid license token: {exc}")
 
-            allowed_versions = module_info.get("allowed_major_versions", [])
-            if odoo_version not in allowed_versions:
-                raise LicenseVerificationError(
-                    "Odoo version '%s' not allowed. Allowed versions: %s"
-                    % (odoo_version, allowed_versions)
-                )
+    def check_claims(
+        self,
+        license_info: LicenseInfo,
+        module_name: str,
+        odoo_version: str,
+        instance_db_uuid: Optional[str],
+        instance_domain: Optional[str],
+    ) -> None:
+        payload = license_info.payload
 
-            if "instance_fingerprint" in payload:
-                if not instance_db_uuid or not instance_domain:
-                    raise LicenseVerificationError(
-                        "License is bound to an instance, but instance details not provided"
-                    )
+        if "exp" in payload:
+            exp_timestamp = payload["exp"]
+            now_timestamp = time.time()
+            if now_timestamp >= exp_timestamp:
+                raise LicenseVerificationError("License has expired")
 
-                expected_fingerprint = self._generate_fingerprint(
-                    instance_db_uuid, instance_domain
-                )
+        if payload.get("iss") != self.expected_issuer:
+            raise LicenseVerificationError(
+                f"Invalid issuer: expected '{self.expected_issuer}', got '{payload.get('iss')}'"
+            )
 
-                if payload["instance_fingerprint"] != expected_fingerprint:
-                    raise LicenseVerificationError(
-                        "Instance fingerprint mismatch. This license is bound to a different instance."
-                    )
+        if license_info.module_technical_name != module_name:
+            raise LicenseVerificationError(
+                "License is for module '%s', not '%s'"
+                % (license_info.module_technical_name, module_name)
+            )
 
-            license_type = payload.get("license_type")
-            if license_type == "demo" and not payload.get("exp"):
-                raise LicenseVerificationError("Demo license must have expiration")
+        if odoo_version not in license_info.allowed_set:
+            raise LicenseVerificationError(
+                "Odoo version '%s' not allowed. Allowed versions: %s"
+                % (odoo_version, payload.get("module", {}).get("allowed_major_versions", []))
+            )
 
-            return payload
+        if "instance_fingerprint" in payload:
+            if not instance_db_uuid or not instance_domain:
+                raise LicenseVerificationError(
+                    "License is bound to an instance, but instance details not provided"
+                )
 
-        except jwt.ExpiredSignatureError:
-            raise LicenseVerificationError("License has expired")
+            expected_fingerprint = self._generate_fingerprint(instance_db_uuid, instance_domain)
 
-        except jwt.InvalidSignatureError:
-            raise LicenseVerificationError("Invalid license signature - possible tampering")
+            if payload["instance_fingerprint"] != expected_fingerprint:
+                raise LicenseVerificationError(
+                    "Instance fingerprint mismatch. This license is bound to a different instance."
+                )
 
-        except jwt.DecodeError as exc:
-            raise LicenseVerificationError(f"License decode error: {exc}")
+        if license_info.license_type == "demo" and not payload.get("exp"):
+            raise LicenseVerificationError("Demo license must have expiration")
 
-        except jwt.InvalidTokenError as exc:
-            raise LicenseVerificationError(f"Invalid license token: {exc}")
+    def _get_cached_license(self, cache_key: bytes) -> Optional[LicenseInfo]:
+        return _verify_cache.get(cache_key)
+
+    def _store_license(self, cache_key: bytes, license_info: LicenseInfo) -> None:
+        now_timestamp = time.time()
+        ttl = _verify_cache.ttl
+        if "exp" in license_info.payload:
+            ttl = min(ttl, license_info.payload["exp"] - now_timestamp)
+        if ttl <= 0:
+            return
+
+        _verify_cache.set(cache_key, license_info, now_timestamp + ttl)
 
     def get_license_info(self, license_token: str) -> Dict[str, Any]:
         try:
-            payload = jwt.decode(license_token, options={"verify_signature": False})
-            return {
-                "license_id": payload.get("jti"),
-                "customer": payload.get("customer", {}),
-                "module": payload.get("module", {}),
-                "license_type": payload.get("license_type"),
-                "issued_at": self._format_timestamp(payload.get("iat")),
-                "expires_at": self._format_timestamp(payload.get("exp")),
-                "is_bound": "instance_fingerprint" in payload,
-            }
+            payload = json.loads(_b64url_decode(license_token.split(".")[1]))
+            return self.get_payload_info(payload)
         except Exception as exc:
             return {"error": f"Failed to decode license: {exc}"}
 
-    def _format_timestamp(self, ts: Optional[int]) -> Optional[str]:
-        if ts is None:
-            return None
-        return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+    def get_payload_info(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "license_id": payload.get("jti"),
+            "customer": payload.get("customer", {}),
+            "module": payload.get("module", {}),
+            "license_type": payload.get("license_type"),
+            "issued_at": _format_timestamp(payload.get("iat")),
+            "expires_at": _format_timestamp(payload.get("exp")),
+            "is_bound": "instance_fingerprint" in payload,
+        }
 
     def _generate_fingerprint(self, db_uuid: str, domain: str) -> str:
-        combined = f"{db_uuid}:{domain}".encode("utf-8")
-        hash_obj = hashlib.sha256(combined)
-        return f"sha256:{hash_obj.hexdigest()}"
+        return _instance_fingerprint(db_uuid, domain)
@@ -0,0 +1 @@
+from . import test_aegis_license
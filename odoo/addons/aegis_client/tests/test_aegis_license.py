@@ -0,0 +1,116 @@
+import hashlib
+import os
+import tempfile
+import time
+import uuid
+from unittest.mock import patch
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
+
+import odoo
+from odoo.exceptions import UserError
+from odoo.tests import TransactionCase, tagged
+
+MODULE_NAME = "aegis_hello"
+
+
+@tagged("post_install", "-at_install")
+class TestAegisLicense(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.private_key = ed25519.Ed25519PrivateKey.generate()
+        cls.foreign_key = ed25519.Ed25519PrivateKey.generate()
+
+        handle, cls.public_key_path = tempfile.mkstemp(suffix=".pem")
+        with os.fdopen(handle, "wb") as key_file:
+            key_file.write(
+                cls.private_key.public_key().public_bytes(
+                    encoding=serialization.Encoding.PEM,
+                    format=serialization.PublicFormat.SubjectPublicKeyInfo,
+                )
+            )
+        cls.addClassCleanup(os.remove, cls.public_key_path)
+
+        License = type(cls.env["aegis.license"])
+        key_patch = patch.object(License, "_get_public_key_path", return_value=cls.public_key_path)
+        key_patch.start()
+        cls.addClassCleanup(key_patch.stop)
+
+        cls.issuer = cls.env["aegis.license"]._get_expected_issuer()
+
+    def _issue(self, key=None, **claims):
+        payload = {
+            "jti": str(uuid.uuid4()),
+            "iss": self.issuer,
+            "iat": int(time.time()),
+            "customer": {"id": "CUST-1", "name": "Test Customer"},
+            "module": {
+                "technical_name": MODULE_NAME,
+                "allowed_major_versions": [odoo.release.major_version],
+            },
+            "license_type": "perpetual",
+            **claims,
+        }
+        return jwt.encode(
+            payload, key or self.private_key, algorithm="EdDSA", headers={"kid": "test"}
+        )
+
+    def _create_license(self, token):
+        return self.env["aegis.license"].create(
+            {"module_name": MODULE_NAME, "license_token": token}
+        )
+
+    def test_rewritten_token_is_verified_again(self):
+        license_rec = self._create_license(self._issue())
+        self.assertTrue(self.env["aegis.license"].action_views_open(MODULE_NAME))
+        self.assertEqual(license_rec.state, "valid")
+
+        license_rec.write({"license_token": self._issue(key=self.foreign_key)})
+        self.assertEqual(license_rec.state, "unknown")
+        self.assertFalse(license_rec.last_verified_at)
+
+        with self.assertRaises(UserError):
+            self.env["aegis.license"].action_views_open(MODULE_NAME)
+        self.assertEqual(license_rec.state, "invalid")
+
+    def test_fresh_result_not_reused_for_other_context(self):
+        fingerprint = "sha256:" + hashlib.sha256(b"db-1:a.example.com").hexdigest()
+        self._create_license(self._issue(instance_fingerprint=fingerprint))
+        License = self.env["aegis.license"]
+        verified = {"instance_db_uuid": "db-1", "instance_domain": "a.example.com"}
+
+        for other in (
+            {"instance_domain": "b.example.com"},
+            {"instance_db_uuid": "db-2"},
+            {"odoo_version": "1"},
+        ):
+            with self.subTest(**other):
+                self.assertTrue(License.action_views_open(MODULE_NAME, **verified))
+                with self.assertRaises(UserError):
+                    License.action_views_open(MODULE_NAME, **{**verified, **other})
+
+    def test_unchanged_perpetual_license_skips_write(self):
+        license_rec = self._create_license(self._issue())
+        License = self.env["aegis.license"]
+        self.assertTrue(License.action_views_open(MODULE_NAME))
+        self.assertFalse(license_rec.expires_at)
+
+        # Force a real re-verification instead of reusing the fresh result.
+        self.env["ir.config_parameter"].sudo().set_param("aegis.verify_ttl_seconds", 0)
+        with patch.object(type(license_rec), "write", autospec=True) as write:
+            self.assertTrue(License.action_views_open(MODULE_NAME))
+        write.assert_not_called()
+
+    def test_not_yet_valid_or_audience_token_is_rejected(self):
+        license_rec = self._create_license(self._issue())
+        future = int(time.time()) + 3600
+
+        for claims in ({"nbf": future}, {"iat": future}, {"aud": "other-service"}):
+            with self.subTest(**claims):
+                license_rec.write({"license_token": self._issue(**claims)})
+                with self.assertRaises(UserError):
+                    self.env["aegis.license"].action_views_open(MODULE_NAME)
+                self.assertEqual(license_rec.state, "invalid")
@@ -74,64 +74,78 @@ class LicenseIssuer:
         Returns:
             Signed JWT license string
         """
-        # Validate license type
-        valid_types = ["perpetual", "subscription", "demo"]
-        if license_type not in valid_types:
-            raise ValueError(f"Invalid license_type. Must be one of: {valid_types}")
+        return self.issue_licenses([{
+            "customer_id": customer_id,
+            "customer_name": customer_name,
+            "module_name": module_name,
+            "allowed_versions": allowed_versions,
+            "license_type": license_type,
+            "duration_days": duration_days,
+            "instance_fingerprint": instance_fingerprint,
+        }])[0]
+    
+    def issue_licenses(self, specs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Issue a batch of signed license JWTs.
+        
+        All licenses in the batch share the same 'iat' and issuer, so the
+        clock is read once and only per-license claims are rebuilt.
         
-        # Generate unique license ID
-        license_id = str(uuid.uuid4())
+        Args:
+            specs: One dict per license, with the keyword arguments of
+                issue_license()
+        
+        Returns:
+            Signed JWT license strings, in the order of specs
+        """
+        valid_types = ["perpetual", "subscription", "demo"]
         
-        # Current timestamp
+        # Current timestamp (shared by the whole batch)
         now = datetime.now(timezone.utc)
         issued_at = int(now.timestamp())
+        base = {"iss": self.issuer, "iat": issued_at}
+        headers = {"kid": self.key_id}
         
-        # Calculate expiration
-        # Note: For perpetual licenses, we omit 'exp' claim entirely
-        # rather than setting it to null (PyJWT doesn't handle null well)
-        expires_at = None
-        if license_type in ["subscription", "demo"]:
-            if duration_days is None:
-                raise ValueError(f"{license_type} licenses require duration_days")
-            expiry_time = now + timedelta(days=duration_days)
-            expires_at = int(expiry_time.timestamp())
-        
-        # Build JWT payload
-        payload = {
-            # Standard JWT claims
-            "jti": license_id,           # JWT ID
-            "iss": self.issuer,           # Issuer
-            "iat": issued_at,             # Issued At
+        tokens = []
+        for spec in specs:
+            license_type = spec.get("license_type", "perpetual")
+            if license_type not in valid_types:
+                raise ValueError(f"Invalid license_type. Must be one of: {valid_types}")
             
-            # AEGIS-specific claims
-            "customer": {
-                "id": customer_id,
-                "name": customer_name
-            },
-            "module": {
-                "technical_name": module_name,
-                "allowed_major_versions": allowed_versions
-            },
-            "license_type": license_type,
-        }
-        
-        # Add expiration only if license has one (subscription/demo)
-        if expires_at is not None:
-            payload["exp"] = expires_at
-        
-        # Add optional instance fingerprint
-        if instance_fingerprint:
-            payload["instance_fingerprint"] = instance_fingerprint
-        
-        # Sign JWT with Ed25519
-        token = jwt.encode(
-            payload,
-            self.private_key,
-            algorithm="EdDSA",
-            headers={"kid": self.key_id}
-        )
+            # Build JWT payload
+            payload = {"jti": str(uuid.uuid4()), **base}
+            payload["customer"] = {
+                "id": spec["customer_id"],
+                "name": spec["customer_name"]
+            }
+            payload["module"] = {
+                "technical_name": spec["module_name"],
+                "allowed_major_versions": spec["allowed_versions"]
+            }
+            payload["license_type"] = license_type
+            
+            # Add expiration only if license has one (subscription/demo)
+            # Note: For perpetual licenses, we omit 'exp' claim entirely
+            # rather than setting it to null (PyJWT doesn't handle null well)
+            if license_type in ["subscription", "demo"]:
+                duration_days = spec.get("duration_days")
+                if duration_days is None:
+                    raise ValueError(f"{license_type} licenses require duration_days")
+                payload["exp"] = int((now + timedelta(days=duration_days)).timestamp())
+            
+            # Add optional instance fingerprint
+            if spec.get("instance_fingerprint"):
+                payload["instance_fingerprint"] = spec["instance_fingerprint"]
+            
+            # Sign JWT with Ed25519
+            tokens.append(jwt.encode(
+                payload,
+                self.private_key,
+                algorithm="EdDSA",
+                headers=headers
+            ))
         
-        return token
+        return tokens
     
     def decode_license(self, token: str, verify: bool = False) -> Dict[str, Any]:
         """
@@ -185,59 +199,57 @@ if __name__ == "__main__":
         print(f"❌ Error loading private key: {e}")
         sys.exit(1)
     
-    # Example 1: Perpetual License
-    print("📜 Example 1: Perpetual License")
-    print("-" * 70)
-    
-    perpetual_license = issuer.issue_license(
-        customer_id="CUST-001",
-        customer_name="Acme Corporation",
-        module_name="biz4a_payroll_drc",
-        allowed_versions=["17", "18"],
-        license_type="perpetual"
+    fingerprint = generate_instance_fingerprint(
+        db_uuid="550e8400-e29b-41d4-a716-446655440000",
+        domain="acme.odoo.com"
     )
     
+    # Issue all examples in a single batch
+    perpetual_license, demo_license, bound_license = issuer.issue_licenses([
+        # Example 1: Perpetual License
+        {
+            "customer_id": "CUST-001",
+            "customer_name": "Acme Corporation",
+            "module_name": "biz4a_payroll_drc",
+            "allowed_versions": ["17", "18"],
+            "license_type": "perpetual",
+        },
+        # Example 2: 30-Day Demo License
+        {
+            "customer_id": "DEMO-123",
+            "customer_name": "Prospect Inc",
+            "module_name": "biz4a_payroll_drc",
+            "allowed_versions": ["18"],
+            "license_type": "demo",
+            "duration_days": 30,
+        },
+        # Example 3: Instance-Bound License
+        {
+            "customer_id": "CUST-002",
+            "customer_name": "SecureCorp Ltd",
+            "module_name": "biz4a_accounting_ohada",
+            "allowed_versions": ["17"],
+            "license_type": "perpetual",
+            "instance_fingerprint": fingerprint,
+        },
+    ])
+    
+    print("📜 Example 1: Perpetual License")
+    print("-" * 70)
     print(f"License Token:\n{perpetual_license}\n")
     
     # Decode to show payload
     decoded = issuer.decode_license(perpetual_license)
     print(f"Decoded Payload:\n{json.dumps(decoded, indent=2)}\n")
     
-    # Example 2: 30-Day Demo License
     print("\n📜 Example 2: 30-Day Demo License")
     print("-" * 70)
-    
-    demo_license = issuer.issue_license(
-        customer_id="DEMO-123",
-        customer_name="Prospect Inc",
-        module_name="biz4a_payroll_drc",
-        allowed_versions=["18"],
-        license_type="demo",
-        duration_days=30
-    )
-    
     print(f"License Token:\n{demo_license}\n")
     decoded = issuer.decode_license(demo_license)
     print(f"Decoded Payload:\n{json.dumps(decoded, indent=2)}\n")
     
-    # Example 3: Instance-Bound License
     print("\n📜 Example 3: Instance-Bound Perpetual License")
     print("-" * 70)
-    
-    fingerprint = generate_instance_fingerprint(
-        db_uuid="550e8400-e29b-41d4-a716-446655440000",
-        domain="acme.odoo.com"
-    )
-    
-    bound_license = issuer.issue_license(
-        customer_id="CUST-002",
-        customer_name="SecureCorp Ltd",
-        module_name="biz4a_accounting_ohada",
-        allowed_versions=["17"],
-        license_type="perpetual",
-        instance_fingerprint=fingerprint
-    )
-    
     print(f"Instance Fingerprint: {fingerprint}")
     print(f"License Token:\n{bound_license}\n")
     decoded = issuer.decode_license(bound_license)
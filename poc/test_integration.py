@@ -12,13 +12,18 @@ Tests the full license lifecycle:
 import os
 import sys
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
+import jwt
+
 # Import our modules
 from generate_keys import generate_keypair
 from issue_license import LicenseIssuer, generate_instance_fingerprint
-from verify_license import LicenseVerifier, LicenseVerificationError
+from verify_license import BatchLicenseVerifier, LicenseVerifier, LicenseVerificationError
 
 
 class TestResults:
@@ -29,19 +34,40 @@ class TestResults:
         self.passed = 0
         self.failed = 0
         self.errors = []
+        self._buf = []
+        self._lock = threading.Lock()
     
     def add_pass(self, test_name: str):
-        self.total += 1
-        self.passed += 1
-        print(f"  ✅ {test_name}")
+        with self._lock:
+            self.total += 1
+            self.passed += 1
+            self._buf.append(f"  ✅ {test_name}\n")
     
     def add_fail(self, test_name: str, reason: str):
-        self.total += 1
-        self.failed += 1
-        self.errors.append((test_name, reason))
-        print(f"  ❌ {test_name}: {reason}")
+        with self._lock:
+            self.total += 1
+            self.failed += 1
+            self.errors.append((test_name, reason))
+            self._buf.append(f"  ❌ {test_name}: {reason}\n")
+    
+    def merge(self, other: "TestResults"):
+        """Fold another result set (e.g. from a worker thread) into this one."""
+        with self._lock:
+            self.total += other.total
+            self.passed += other.passed
+            self.failed += other.failed
+            self.errors.extend(other.errors)
+            self._buf.extend(other._buf)
+    
+    def flush(self):
+        """Write the buffered result lines in one go (call at suite boundaries)."""
+        with self._lock:
+            buf, self._buf = self._buf, []
+        if buf:
+            sys.stdout.write("".join(buf))
     
     def summary(self):
+        self.flush()
         print("\n" + "=" * 70)
         print("TEST SUMMARY")
         print("=" * 70)
@@ -59,6 +85,13 @@ class TestResults:
             return True
 
 
+def _run_suite(suite) -> TestResults:
+    """Run one test suite against a fresh TestResults (used by worker threads)."""
+    suite_results = TestResults()
+    suite(suite_results)
+    return suite_results
+
+
 def run_integration_test():
     """Run complete integration test suite."""
     
@@ -116,6 +149,7 @@ def run_integration_test():
         # ================================================================
         # TEST SUITE 2: License Issuance
         # ================================================================
+        results.flush()
         print("\n📝 Test Suite 2: License Issuance")
         print("-" * 70)
         
@@ -202,6 +236,7 @@ def run_integration_test():
         # ================================================================
         # TEST SUITE 3: License Verification
         # ================================================================
+        results.flush()
         print("\n📝 Test Suite 3: License Verification")
         print("-" * 70)
         
@@ -212,153 +247,236 @@ def run_integration_test():
             results.add_fail("Initialize license verifier", str(e))
             return results
         
-        # Test valid perpetual license
-        try:
-            verifier.verify_license(
-                perpetual,
-                module_name="test_module",
-                odoo_version="17"
-            )
-            results.add_pass("Verify valid perpetual license")
-        except Exception as e:
-            results.add_fail("Verify valid perpetual license", str(e))
-        
-        # Test valid demo license
-        try:
-            verifier.verify_license(
-                demo,
-                module_name="test_module",
-                odoo_version="17"
-            )
-            results.add_pass("Verify valid demo license")
-        except Exception as e:
-            results.add_fail("Verify valid demo license", str(e))
+        # Suites 3-5 only read the verifier and the issued tokens, so they run
+        # concurrently; each collects into its own TestResults and the output
+        # is merged back in suite order.
+        def verification_suite(results):
+            # Test valid perpetual license
+            try:
+                verifier.verify_license(
+                    perpetual,
+                    module_name="test_module",
+                    odoo_version="17"
+                )
+                results.add_pass("Verify valid perpetual license")
+            except Exception as e:
+                results.add_fail("Verify valid perpetual license", str(e))
         
-        # Test wrong module name
-        try:
-            verifier.verify_license(
-                perpetual,
-                module_name="wrong_module",
-                odoo_version="17"
-            )
-            results.add_fail("Reject wrong module", "Should have raised error")
-        except LicenseVerificationError:
-            results.add_pass("Reject wrong module")
-        except Exception as e:
-            results.add_fail("Reject wrong module", f"Wrong error: {e}")
+            # Test valid demo license
+            try:
+                verifier.verify_license(
+                    demo,
+                    module_name="test_module",
+                    odoo_version="17"
+                )
+                results.add_pass("Verify valid demo license")
+            except Exception as e:
+                results.add_fail("Verify valid demo license", str(e))
         
-        # Test wrong version
-        try:
-            verifier.verify_license(
-                perpetual,
-                module_name="test_module",
-                odoo_version="16"
-            )
-            results.add_fail("Reject wrong version", "Should have raised error")
-        except LicenseVerificationError:
-            results.add_pass("Reject wrong version")
-        except Exception as e:
-            results.add_fail("Reject wrong version", f"Wrong error: {e}")
+            # Test wrong module name
+            try:
+                verifier.verify_license(
+                    perpetual,
+                    module_name="wrong_module",
+                    odoo_version="17"
+                )
+                results.add_fail("Reject wrong module", "Should have raised error")
+            except LicenseVerificationError:
+                results.add_pass("Reject wrong module")
+            except Exception as e:
+                results.add_fail("Reject wrong module", f"Wrong error: {e}")
         
-        # Test correct instance binding
-        try:
-            verifier.verify_license(
-                bound,
-                module_name="test_module",
-                odoo_version="17",
-                instance_db_uuid="test-db-uuid",
-                instance_domain="test.odoo.com"
-            )
-            results.add_pass("Accept correct instance binding")
-        except Exception as e:
-            results.add_fail("Accept correct instance binding", str(e))
+            # Test wrong version
+            try:
+                verifier.verify_license(
+                    perpetual,
+                    module_name="test_module",
+                    odoo_version="16"
+                )
+                results.add_fail("Reject wrong version", "Should have raised error")
+            except LicenseVerificationError:
+                results.add_pass("Reject wrong version")
+            except Exception as e:
+                results.add_fail("Reject wrong version", f"Wrong error: {e}")
         
-        # Test wrong instance binding
-        try:
-            verifier.verify_license(
-                bound,
-                module_name="test_module",
-                odoo_version="17",
-                instance_db_uuid="wrong-uuid",
-                instance_domain="wrong.odoo.com"
-            )
-            results.add_fail("Reject wrong instance", "Should have raised error")
-        except LicenseVerificationError:
-            results.add_pass("Reject wrong instance")
-        except Exception as e:
-            results.add_fail("Reject wrong instance", f"Wrong error: {e}")
+            # Test correct instance binding
+            try:
+                verifier.verify_license(
+                    bound,
+                    module_name="test_module",
+                    odoo_version="17",
+                    instance_db_uuid="test-db-uuid",
+                    instance_domain="test.odoo.com"
+                )
+                results.add_pass("Accept correct instance binding")
+            except Exception as e:
+                results.add_fail("Accept correct instance binding", str(e))
         
-        # ================================================================
-        # TEST SUITE 4: Tampering Detection
-        # ================================================================
-        print("\n📝 Test Suite 4: Tampering Detection")
-        print("-" * 70)
+            # Test wrong instance binding
+            try:
+                verifier.verify_license(
+                    bound,
+                    module_name="test_module",
+                    odoo_version="17",
+                    instance_db_uuid="wrong-uuid",
+                    instance_domain="wrong.odoo.com"
+                )
+                results.add_fail("Reject wrong instance", "Should have raised error")
+            except LicenseVerificationError:
+                results.add_pass("Reject wrong instance")
+            except Exception as e:
+                results.add_fail("Reject wrong instance", f"Wrong error: {e}")
+
+        def tampering_suite(results):
+            # Test tampered signature
+            try:
+                tampered = perpetual[:-10] + "TAMPERED!"
+                verifier.verify_license(
+                    tampered,
+                    module_name="test_module",
+                    odoo_version="17"
+                )
+                results.add_fail("Detect tampered signature", "Should have raised error")
+            except (LicenseVerificationError, Exception):
+                results.add_pass("Detect tampered signature")
         
-        # Test tampered signature
-        try:
-            tampered = perpetual[:-10] + "TAMPERED!"
-            verifier.verify_license(
-                tampered,
-                module_name="test_module",
-                odoo_version="17"
-            )
-            results.add_fail("Detect tampered signature", "Should have raised error")
-        except (LicenseVerificationError, Exception):
-            results.add_pass("Detect tampered signature")
+            # Test corrupted payload
+            try:
+                parts = perpetual.split('.')
+                if len(parts) == 3:
+                    corrupted = parts[0] + ".CORRUPTED." + parts[2]
+                    verifier.verify_license(
+                        corrupted,
+                        module_name="test_module",
+                        odoo_version="17"
+                    )
+                    results.add_fail("Detect corrupted payload", "Should have raised error")
+                else:
+                    results.add_fail("Detect corrupted payload", "Invalid token format")
+            except (LicenseVerificationError, Exception):
+                results.add_pass("Detect corrupted payload")
+
+        def edge_case_suite(results):
+            # Test empty token
+            try:
+                verifier.verify_license(
+                    "",
+                    module_name="test_module",
+                    odoo_version="17"
+                )
+                results.add_fail("Reject empty token", "Should have raised error")
+            except (LicenseVerificationError, Exception):
+                results.add_pass("Reject empty token")
         
-        # Test corrupted payload
-        try:
-            parts = perpetual.split('.')
-            if len(parts) == 3:
-                corrupted = parts[0] + ".CORRUPTED." + parts[2]
+            # Test malformed token
+            try:
                 verifier.verify_license(
-                    corrupted,
+                    "not.a.jwt",
                     module_name="test_module",
                     odoo_version="17"
                 )
-                results.add_fail("Detect corrupted payload", "Should have raised error")
-            else:
-                results.add_fail("Detect corrupted payload", "Invalid token format")
-        except (LicenseVerificationError, Exception):
-            results.add_pass("Detect corrupted payload")
+                results.add_fail("Reject malformed token", "Should have raised error")
+            except (LicenseVerificationError, Exception):
+                results.add_pass("Reject malformed token")
         
-        # ================================================================
-        # TEST SUITE 5: Edge Cases
-        # ================================================================
-        print("\n📝 Test Suite 5: Edge Cases")
-        print("-" * 70)
+            # Signed tokens with claims only PyJWT checks
+            base_claims = jwt.decode(perpetual, options={"verify_signature": False})
+            future = int(time.time()) + 3600
+            for name, claims in (
+                ("Reject not-yet-valid token (nbf)", {"nbf": future}),
+                ("Reject token issued in the future (iat)", {"iat": future}),
+                ("Reject token with an audience (aud)", {"aud": "other-service"}),
+            ):
+                token = jwt.encode(
+                    {**base_claims, **claims}, issuer.private_key, algorithm="EdDSA"
+                )
+                try:
+                    verifier.verify_license(
+                        token,
+                        module_name="test_module",
+                        odoo_version="17"
+                    )
+                    results.add_fail(name, "Should have raised error")
+                except LicenseVerificationError:
+                    results.add_pass(name)
+                except Exception as e:
+                    results.add_fail(name, f"Wrong error: {e}")
         
-        # Test empty token
-        try:
-            verifier.verify_license(
-                "",
-                module_name="test_module",
-                odoo_version="17"
+            # Test forged token does not get its header remembered
+            forged = jwt.encode(
+                base_claims,
+                issuer.private_key,
+                algorithm="EdDSA",
+                headers={"kid": "forged-key"}
             )
-            results.add_fail("Reject empty token", "Should have raised error")
-        except (LicenseVerificationError, Exception):
-            results.add_pass("Reject empty token")
+            forged = forged.rsplit(".", 1)[0] + "." + perpetual.rsplit(".", 1)[1]
+            try:
+                verifier.verify_license(
+                    forged,
+                    module_name="test_module",
+                    odoo_version="17"
+                )
+                results.add_fail("Reject forged header", "Should have raised error")
+            except LicenseVerificationError:
+                if forged.split(".", 1)[0].encode() in verifier._accepted_headers:
+                    results.add_fail("Reject forged header", "Header was remembered")
+                else:
+                    results.add_pass("Reject forged header")
+            except Exception as e:
+                results.add_fail("Reject forged header", f"Wrong error: {e}")
         
-        # Test malformed token
-        try:
-            verifier.verify_license(
-                "not.a.jwt",
-                module_name="test_module",
-                odoo_version="17"
-            )
-            results.add_fail("Reject malformed token", "Should have raised error")
-        except (LicenseVerificationError, Exception):
-            results.add_pass("Reject malformed token")
+            # Test batch verification
+            try:
+                batch = BatchLicenseVerifier(public_key_path)
+                tampered = perpetual[:-10] + "TAMPERED!"
+                indexes = [
+                    batch.add(perpetual, "test_module", "17"),
+                    batch.add(tampered, "test_module", "17"),
+                    batch.add(demo, "test_module", "17"),
+                ]
+                batch_results = batch.verify_all()
+                (first, first_error), (bad, bad_error), (last, last_error) = batch_results
+                if indexes != [0, 1, 2]:
+                    results.add_fail("Batch verification", f"Unexpected indexes: {indexes}")
+                elif (
+                    first_error or last_error
+                    or first["license_type"] != "perpetual"
+                    or last["license_type"] != "demo"
+                ):
+                    results.add_fail("Batch verification", "Results out of order or rejected")
+                elif bad is not None or not isinstance(bad_error, LicenseVerificationError):
+                    results.add_fail("Batch verification", "Tampered token was accepted")
+                elif batch.verify_all():
+                    results.add_fail("Batch verification", "Queue was not cleared")
+                else:
+                    results.add_pass("Batch verification")
+            except Exception as e:
+                results.add_fail("Batch verification", str(e))
         
-        # Test get_license_info
-        try:
-            info = verifier.get_license_info(perpetual)
-            if "license_id" in info and "customer" in info:
-                results.add_pass("Extract license info")
-            else:
-                results.add_fail("Extract license info", "Missing fields")
-        except Exception as e:
-            results.add_fail("Extract license info", str(e))
+            # Test get_license_info
+            try:
+                info = verifier.get_license_info(perpetual)
+                if "license_id" in info and "customer" in info:
+                    results.add_pass("Extract license info")
+                else:
+                    results.add_fail("Extract license info", "Missing fields")
+            except Exception as e:
+                results.add_fail("Extract license info", str(e))
+
+        suites = [
+            (None, verification_suite),
+            ("📝 Test Suite 4: Tampering Detection", tampering_suite),
+            ("📝 Test Suite 5: Edge Cases", edge_case_suite),
+        ]
+        with ThreadPoolExecutor(max_workers=len(suites)) as executor:
+            futures = [(title, executor.submit(_run_suite, suite)) for title, suite in suites]
+        
+        for title, future in futures:
+            if title:
+                results.flush()
+                print("\n" + title)
+                print("-" * 70)
+            results.merge(future.result())
     
     # Return results
     return results
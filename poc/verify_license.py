@@ -7,17 +7,228 @@ This would be embedded in the AEGIS client module in production.
 """
 
 import jwt
+import base64
+import binascii
+import functools
 import hashlib
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
-from typing import Dict, Any, Optional, List, Tuple
-from pathlib import Path
+from typing import Dict, Any, FrozenSet, NamedTuple, Optional, List, Tuple
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
+try:
+    # SIMD base64 decoder; the stdlib decoder is used when it is not installed
+    from pybase64 import urlsafe_b64decode as _urlsafe_b64decode
+except ImportError:
+    _urlsafe_b64decode = base64.urlsafe_b64decode
+
+
+_RULE_OK = 0
+_RULE_EXPIRED = 1
+_RULE_ISSUER = 2
+_RULE_MODULE = 3
+_RULE_VERSION = 4
+_RULE_INSTANCE_MISSING = 5
+_RULE_FINGERPRINT = 6
+_RULE_DEMO_EXP = 7
+
+# Message templates per rule code. Arguments are, in order: expected issuer,
+# token issuer, token module, expected module, Odoo version, allowed versions.
+_RULE_MESSAGES = {
+    _RULE_EXPIRED: "License has expired",
+    _RULE_ISSUER: "Invalid issuer: expected '{0}', got '{1}'",
+    _RULE_MODULE: "License is for module '{2}', not '{3}'",
+    _RULE_VERSION: "Odoo version '{4}' not allowed. Allowed versions: {5}",
+    _RULE_INSTANCE_MISSING: "License is bound to an instance, but instance details not provided",
+    _RULE_FINGERPRINT: "Instance fingerprint mismatch. This license is bound to a different instance.",
+    _RULE_DEMO_EXP: "Demo license must have expiration",
+}
+
 
 class LicenseVerificationError(Exception):
-    """Raised when license verification fails."""
-    pass
+    """
+    Raised when license verification fails.
+    
+    Business-rule rejections carry a rule ``code`` and the raw ``detail``
+    values; the message is only formatted when the error is converted to a
+    string, so callers that just check ``code`` never pay for it.
+    """
+    __slots__ = ("code", "detail")
+    
+    EXPIRED = _RULE_EXPIRED
+    ISSUER_MISMATCH = _RULE_ISSUER
+    MODULE_MISMATCH = _RULE_MODULE
+    VERSION_NOT_ALLOWED = _RULE_VERSION
+    INSTANCE_MISSING = _RULE_INSTANCE_MISSING
+    FINGERPRINT_MISMATCH = _RULE_FINGERPRINT
+    DEMO_WITHOUT_EXPIRY = _RULE_DEMO_EXP
+    
+    def __init__(self, detail: Any = None, code: Optional[int] = None):
+        super().__init__(detail)
+        self.code = code
+        self.detail = detail
+    
+    def __str__(self) -> str:
+        if self.code is None:
+            return str(self.detail)
+        return _RULE_MESSAGES[self.code].format(*self.detail)
+
+
+_B64PAD = (b"", b"===", b"==", b"=")
+_REQUIRED_CLAIMS = frozenset(("jti", "iss", "iat"))
+# Header keys the fast path understands; anything else goes through PyJWT
+_ACCEPTED_HEADER_KEYS = frozenset(("alg", "kid", "typ"))
+
+# Header segments differ only by 'kid', so a handful of accepted ones are remembered
+_MAX_ACCEPTED_HEADERS = 16
+
+# Verified results are reused for at most this long (or until 'exp').
+_CACHE_MAX_ENTRIES = 1024
+_CACHE_DEFAULT_TTL = 60.0
+
+
+def _b64url_decode(segment: bytes) -> bytes:
+    """Decode an unpadded base64url JWT segment."""
+    return _urlsafe_b64decode(segment + _B64PAD[len(segment) & 3])
+
+
+def _is_plain_header(header_segment: bytes) -> bool:
+    """True if a JWT header segment is EdDSA with only alg/kid/typ keys."""
+    try:
+        header = json.loads(_b64url_decode(header_segment))
+    except (binascii.Error, ValueError):
+        return False
+    return (
+        isinstance(header, dict)
+        and header.get("alg") == "EdDSA"
+        and header.keys() <= _ACCEPTED_HEADER_KEYS
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _load_cached(key_path: str, mtime_ns: int) -> ed25519.Ed25519PublicKey:
+    """Parse a PEM public key once per (path, modification time)."""
+    with open(key_path, "rb") as f:
+        public_key = serialization.load_pem_public_key(f.read())
+    
+    if not isinstance(public_key, ed25519.Ed25519PublicKey):
+        raise ValueError("Key is not an Ed25519 public key")
+    
+    return public_key
+
+
+@functools.lru_cache(maxsize=256)
+def _fingerprint_digest(db_uuid: str, domain: str) -> bytes:
+    """Raw instance fingerprint, memoized: most processes only ever see one instance."""
+    return hashlib.sha256(f"{db_uuid}:{domain}".encode("utf-8")).digest()
+
+
+def _fingerprint(db_uuid: str, domain: str) -> bytes:
+    return b"sha256:" + binascii.b2a_hex(_fingerprint_digest(db_uuid, domain))
+
+
+def _parse_fingerprint(fingerprint: Any) -> Optional[bytes]:
+    """Return the raw digest of a 'sha256:<hex>' fingerprint, or None if malformed."""
+    if not isinstance(fingerprint, str) or not fingerprint.startswith("sha256:"):
+        return None
+    try:
+        return bytes.fromhex(fingerprint[7:])
+    except ValueError:
+        return None
+
+
+class LicensePayload(NamedTuple):
+    """The claims the business rules read, extracted once from a payload dict."""
+    iss: Any
+    exp: Optional[float]
+    license_type: Any
+    technical_name: Any
+    allowed_major_versions: List[str]
+    allowed_versions: FrozenSet[str]
+    bound_digest: Optional[bytes]
+    
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "LicensePayload":
+        module_info = payload.get("module", {})
+        allowed_major_versions = module_info.get("allowed_major_versions", [])
+        bound_digest = None
+        if "instance_fingerprint" in payload:
+            # Malformed fingerprints become b"", which never matches
+            bound_digest = _parse_fingerprint(payload["instance_fingerprint"]) or b""
+        return cls(
+            iss=payload.get("iss"),
+            exp=payload.get("exp"),
+            license_type=payload.get("license_type"),
+            technical_name=module_info.get("technical_name"),
+            allowed_major_versions=allowed_major_versions,
+            allowed_versions=frozenset(allowed_major_versions),
+            bound_digest=bound_digest,
+        )
+
+
+@functools.lru_cache(maxsize=16)
+def _make_rule_validator(expected_issuer: str):
+    """
+    Build the business-rule check specialized for one issuer.
+    
+    The issuer and helpers are bound as closure constants, so the returned
+    function does no attribute lookups on the verifier per call.
+    """
+    compare_digest = hmac.compare_digest
+    
+    def _validate_rules(
+        issuer: Any,
+        module_name: Any,
+        expected_module: str,
+        allowed_versions: Any,
+        odoo_version: str,
+        now_ts: float,
+        exp_ts: Optional[float],
+        bound_digest: Optional[bytes],
+        instance_digest: Optional[bytes],
+        license_type: Any
+    ) -> int:
+        """
+        Check the license business rules on plain values.
+        
+        Returns:
+            _RULE_OK, or the code of the first rule that fails (in the order
+            expiration, issuer, module, version, instance binding, demo expiry)
+        """
+        if exp_ts is not None and now_ts >= exp_ts:
+            return _RULE_EXPIRED
+        if issuer != expected_issuer:
+            return _RULE_ISSUER
+        if module_name != expected_module:
+            return _RULE_MODULE
+        if odoo_version not in allowed_versions:
+            return _RULE_VERSION
+        if bound_digest is not None:
+            if instance_digest is None:
+                return _RULE_INSTANCE_MISSING
+            # Constant-time comparison of the raw 32-byte digests
+            if not compare_digest(bound_digest, instance_digest):
+                return _RULE_FINGERPRINT
+        if license_type == "demo" and not exp_ts:
+            return _RULE_DEMO_EXP
+        return _RULE_OK
+    
+    return _validate_rules
+
+
+def _key_mtime_ns(key_path: str) -> int:
+    try:
+        return os.stat(key_path).st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Public key not found: {key_path}")
 
 
 class LicenseVerifier:
@@ -35,23 +246,40 @@ class LicenseVerifier:
             public_key_path: Path to Ed25519 public key (PEM format)
             expected_issuer: Expected JWT issuer claim
         """
+        self.public_key_path = public_key_path
+        self.expected_issuer = sys.intern(expected_issuer)
+        # The issuer exactly as a JSON encoder writes it, for a cheap pre-parse reject
+        self._expected_issuer_bytes = json.dumps(expected_issuer).encode("ascii")
+        self._accepted_headers: set = set()
+        self._validate_rules = _make_rule_validator(self.expected_issuer)
+        self._cache: "OrderedDict[bytes, Tuple[float, Dict[str, Any], LicensePayload]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
         self.public_key = self._load_public_key(public_key_path)
-        self.expected_issuer = expected_issuer
     
     def _load_public_key(self, key_path: str) -> ed25519.Ed25519PublicKey:
-        """Load Ed25519 public key from PEM file."""
-        key_path_obj = Path(key_path)
-        if not key_path_obj.exists():
-            raise FileNotFoundError(f"Public key not found: {key_path}")
-        
-        with open(key_path, "rb") as f:
-            public_key = serialization.load_pem_public_key(f.read())
-        
-        if not isinstance(public_key, ed25519.Ed25519PublicKey):
-            raise ValueError("Key is not an Ed25519 public key")
-        
+        """Load Ed25519 public key from PEM file (parsed keys are cached)."""
+        self.key_mtime_ns = _key_mtime_ns(key_path)
+        public_key = _load_cached(key_path, self.key_mtime_ns)
+        self._cache_salt = public_key.public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw
+        )
+        with self._cache_lock:
+            self._cache.clear()
         return public_key
     
+    def reload_public_key(self) -> bool:
+        """
+        Reload the public key if its file changed on disk.
+        
+        Returns:
+            True if the key was reloaded (the verification cache is reset)
+        """
+        if _key_mtime_ns(self.public_key_path) == self.key_mtime_ns:
+            return False
+        self.public_key = self._load_public_key(self.public_key_path)
+        return True
+    
     def verify_license(
         self,
         license_token: str,
@@ -76,79 +304,146 @@ class LicenseVerifier:
         Raises:
             LicenseVerificationError: If verification fails
         """
-        try:
+        # Signature-verified payloads are cached per token; the business
+        # rules below still run on every call.
+        cache_key = hashlib.blake2b(
+            license_token.encode("utf-8"), digest_size=16, key=self._cache_salt
+        ).digest()
+        entry = self._get_cached(cache_key)
+        if entry is None:
             # Step 1: Verify JWT signature
-            payload = jwt.decode(
+            payload = self._verify_signature(license_token)
+            claims = LicensePayload.from_dict(payload)
+            self._store_cached(cache_key, payload, claims)
+        else:
+            payload, claims = entry
+        
+        self._check_claims(
+            payload, module_name, odoo_version, instance_db_uuid, instance_domain,
+            claims=claims
+        )
+        
+        # All checks passed
+        return dict(payload)
+    
+    def _get_cached(self, cache_key: bytes) -> Optional[Tuple[Dict[str, Any], LicensePayload]]:
+        """Return a still-valid cached (payload, claims) pair, if any."""
+        with self._cache_lock:
+            entry = self._cache.get(cache_key)
+            if entry is None:
+                return None
+            expiry, payload, claims = entry
+            if time.monotonic() >= expiry:
+                del self._cache[cache_key]
+                return None
+            self._cache.move_to_end(cache_key)
+        return payload, claims
+    
+    def _store_cached(
+        self,
+        cache_key: bytes,
+        payload: Dict[str, Any],
+        claims: LicensePayload
+    ) -> None:
+        """Cache a verified payload until 'exp' or the default TTL, whichever is first."""
+        ttl = _CACHE_DEFAULT_TTL
+        if "exp" in payload:
+            ttl = min(ttl, payload["exp"] - time.time())
+        if ttl <= 0:
+            return
+        
+        with self._cache_lock:
+            self._cache[cache_key] = (time.monotonic() + ttl, dict(payload), claims)
+            if len(self._cache) > _CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+    
+    def _fast_decode(self, license_token: str) -> Optional[Tuple[Dict[str, Any], bytes, bytes, bytes]]:
+        """
+        Split and decode a JWT without going through PyJWT.
+        
+        Returns:
+            (payload, signing_input, signature, header_segment); the
+            signature is NOT checked. None if the header is not a plain
+            EdDSA header, so the caller can hand the token to PyJWT.
+        
+        Raises:
+            LicenseVerificationError: If the token is malformed
+        """
+        try:
+            raw = license_token.encode("ascii")
+        except UnicodeError as e:
+            raise LicenseVerificationError(f"License decode error: {e}")
+        
+        segments = raw.split(b".", 2)
+        if len(segments) != 3:
+            raise LicenseVerificationError("License decode error: Not enough segments")
+        header_segment, payload_segment, signature_segment = segments
+        
+        if header_segment not in self._accepted_headers and not _is_plain_header(header_segment):
+            return None
+        
+        try:
+            payload_json = _b64url_decode(payload_segment)
+            if self._expected_issuer_bytes not in payload_json:
+                raise LicenseVerificationError(
+                    f"Invalid issuer: expected '{self.expected_issuer}'"
+                )
+            payload = json.loads(payload_json)
+            signature = _b64url_decode(signature_segment)
+        except (binascii.Error, ValueError) as e:
+            raise LicenseVerificationError(f"License decode error: {e}")
+        
+        if not isinstance(payload, dict):
+            raise LicenseVerificationError("License decode error: payload is not an object")
+        
+        signing_input = raw[:len(header_segment) + len(payload_segment) + 1]
+        return payload, signing_input, signature, header_segment
+    
+    def _verify_signature(self, license_token: str) -> Dict[str, Any]:
+        """Check the EdDSA signature of a token and return its payload."""
+        decoded = self._fast_decode(license_token)
+        if decoded is None:
+            return self._decode_pyjwt(license_token)
+        payload, signing_input, signature, header_segment = decoded
+        
+        try:
+            self.public_key.verify(signature, signing_input)
+        except InvalidSignature:
+            raise LicenseVerificationError("Invalid license signature - possible tampering")
+        
+        if not payload.keys() >= _REQUIRED_CLAIMS:
+            missing = sorted(_REQUIRED_CLAIMS - payload.keys())
+            raise LicenseVerificationError(
+                f'Invalid license token: Token is missing the "{missing[0]}" claim'
+            )
+        if not isinstance(payload["iat"], (int, float)):
+            raise LicenseVerificationError(
+                "Invalid license token: Issued At claim (iat) must be an integer."
+            )
+        
+        # PyJWT owns the time-sensitive and audience checks
+        if "nbf" in payload or "aud" in payload or payload["iat"] > time.time():
+            return self._decode_pyjwt(license_token)
+        
+        # Only a header that came with a valid signature is remembered
+        if len(self._accepted_headers) < _MAX_ACCEPTED_HEADERS:
+            self._accepted_headers.add(header_segment)
+        
+        return payload
+    
+    def _decode_pyjwt(self, license_token: str) -> Dict[str, Any]:
+        """Verify a token with jwt.decode (headers or claims the fast path skips)."""
+        try:
+            return jwt.decode(
                 license_token,
                 self.public_key,
                 algorithms=["EdDSA"],
                 options={
                     "verify_signature": True,
                     "verify_exp": False,  # We'll handle expiration manually
-                    "require": ["jti", "iss", "iat"]
+                    "require": sorted(_REQUIRED_CLAIMS)
                 }
             )
-            
-            # Step 1b: Manually check expiration if present
-            if "exp" in payload:
-                exp_timestamp = payload["exp"]
-                now_timestamp = datetime.now(timezone.utc).timestamp()
-                if now_timestamp >= exp_timestamp:
-                    raise jwt.ExpiredSignatureError("License has expired")
-            
-            # Step 2: Verify issuer
-            if payload.get("iss") != self.expected_issuer:
-                raise LicenseVerificationError(
-                    f"Invalid issuer: expected '{self.expected_issuer}', "
-                    f"got '{payload.get('iss')}'"
-                )
-            
-            # Step 3: Verify module name
-            module_info = payload.get("module", {})
-            if module_info.get("technical_name") != module_name:
-                raise LicenseVerificationError(
-                    f"License is for module '{module_info.get('technical_name')}', "
-                    f"not '{module_name}'"
-                )
-            
-            # Step 4: Verify Odoo version
-            allowed_versions = module_info.get("allowed_major_versions", [])
-            if odoo_version not in allowed_versions:
-                raise LicenseVerificationError(
-                    f"Odoo version '{odoo_version}' not allowed. "
-                    f"Allowed versions: {allowed_versions}"
-                )
-            
-            # Step 5: Verify instance fingerprint (if license is bound)
-            if "instance_fingerprint" in payload:
-                if not instance_db_uuid or not instance_domain:
-                    raise LicenseVerificationError(
-                        "License is bound to an instance, but instance details not provided"
-                    )
-                
-                expected_fingerprint = self._generate_fingerprint(
-                    instance_db_uuid, instance_domain
-                )
-                
-                if payload["instance_fingerprint"] != expected_fingerprint:
-                    raise LicenseVerificationError(
-                        f"Instance fingerprint mismatch. "
-                        f"This license is bound to a different instance."
-                    )
-            
-            # Step 6: Check license type specific rules
-            license_type = payload.get("license_type")
-            
-            if license_type == "demo":
-                # Demo licenses must have expiration
-                if not payload.get("exp"):
-                    raise LicenseVerificationError("Demo license must have expiration")
-            
-            # All checks passed
-            return payload
-            
-        except jwt.ExpiredSignatureError:
-            raise LicenseVerificationError("License has expired")
         
         except jwt.InvalidSignatureError:
             raise LicenseVerificationError("Invalid license signature - possible tampering")
@@ -159,11 +454,58 @@ class LicenseVerifier:
         except jwt.InvalidTokenError as e:
             raise LicenseVerificationError(f"Invalid license token: {e}")
     
-    def _generate_fingerprint(self, db_uuid: str, domain: str) -> str:
+    def _check_claims(
+        self,
+        payload: Dict[str, Any],
+        module_name: str,
+        odoo_version: str,
+        instance_db_uuid: Optional[str] = None,
+        instance_domain: Optional[str] = None,
+        claims: Optional[LicensePayload] = None
+    ) -> None:
+        """
+        Validate business rules on a signature-verified payload.
+        
+        Args:
+            claims: LicensePayload.from_dict(payload), if already built
+        
+        Raises:
+            LicenseVerificationError: If any rule fails
+        """
+        if claims is None:
+            claims = LicensePayload.from_dict(payload)
+        instance_digest = None
+        if claims.bound_digest is not None and instance_db_uuid and instance_domain:
+            instance_digest = _fingerprint_digest(instance_db_uuid, instance_domain)
+        
+        code = self._validate_rules(
+            claims.iss,
+            claims.technical_name,
+            module_name,
+            claims.allowed_versions,
+            odoo_version,
+            time.time(),
+            claims.exp,
+            claims.bound_digest,
+            instance_digest,
+            claims.license_type,
+        )
+        if code != _RULE_OK:
+            raise LicenseVerificationError(
+                (
+                    self.expected_issuer,
+                    claims.iss,
+                    claims.technical_name,
+                    module_name,
+                    odoo_version,
+                    claims.allowed_major_versions,
+                ),
+                code=code,
+            )
+    
+    def _generate_fingerprint(self, db_uuid: str, domain: str) -> bytes:
         """Generate instance fingerprint for comparison."""
-        combined = f"{db_uuid}:{domain}".encode('utf-8')
-        hash_obj = hashlib.sha256(combined)
-        return f"sha256:{hash_obj.hexdigest()}"
+        return _fingerprint(db_uuid, domain)
     
     def get_license_info(self, license_token: str) -> Dict[str, Any]:
         """
@@ -177,22 +519,28 @@ class LicenseVerifier:
                 options={"verify_signature": False}
             )
             
-            # Extract readable information
-            info = {
-                "license_id": payload.get("jti"),
-                "customer": payload.get("customer", {}),
-                "module": payload.get("module", {}),
-                "license_type": payload.get("license_type"),
-                "issued_at": self._format_timestamp(payload.get("iat")),
-                "expires_at": self._format_timestamp(payload.get("exp")),
-                "is_bound": "instance_fingerprint" in payload
-            }
-            
-            return info
+            return self.get_license_info_from_payload(payload)
         
         except Exception as e:
             return {"error": f"Failed to decode license: {e}"}
     
+    def get_license_info_from_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract license information from an already-decoded payload.
+        
+        Use this with the result of verify_license() to avoid decoding the
+        token a second time.
+        """
+        return {
+            "license_id": payload.get("jti"),
+            "customer": payload.get("customer", {}),
+            "module": payload.get("module", {}),
+            "license_type": payload.get("license_type"),
+            "issued_at": self._format_timestamp(payload.get("iat")),
+            "expires_at": self._format_timestamp(payload.get("exp")),
+            "is_bound": "instance_fingerprint" in payload
+        }
+    
     def _format_timestamp(self, ts: Optional[int]) -> Optional[str]:
         """Convert Unix timestamp to readable format."""
         if ts is None:
@@ -200,8 +548,89 @@ class LicenseVerifier:
         return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
 
 
+class BatchLicenseVerifier(LicenseVerifier):
+    """
+    Queues license tokens and verifies them with a single verify_all() call.
+    
+    Neither cryptography nor PyNaCl exposes batch Ed25519 verification, so
+    verify_all() still checks each token with verify_license(), one at a
+    time and through the same payload cache. It collects a (payload, error)
+    pair per token instead of raising on the first failure; a batch backend
+    would plug in here.
+    """
+    
+    def __init__(self, public_key_path: str, expected_issuer: str = "https://license.biz4a.com"):
+        super().__init__(public_key_path, expected_issuer)
+        self._pending: List[Tuple[str, str, str, Optional[str], Optional[str]]] = []
+    
+    def add(
+        self,
+        license_token: str,
+        module_name: str,
+        odoo_version: str,
+        instance_db_uuid: Optional[str] = None,
+        instance_domain: Optional[str] = None
+    ) -> int:
+        """
+        Queue a license token for verification.
+        
+        Returns:
+            Index of the token in the results of verify_all()
+        """
+        self._pending.append(
+            (license_token, module_name, odoo_version, instance_db_uuid, instance_domain)
+        )
+        return len(self._pending) - 1
+    
+    def verify_all(self) -> List[Tuple[Optional[Dict[str, Any]], Optional[LicenseVerificationError]]]:
+        """
+        Verify every queued token and clear the queue.
+        
+        Returns:
+            One (payload, error) pair per queued token, in the order added.
+            Exactly one of the two is set.
+        """
+        pending, self._pending = self._pending, []
+        results: List[Tuple[Optional[Dict[str, Any]], Optional[LicenseVerificationError]]] = []
+        
+        for license_token, module_name, odoo_version, db_uuid, domain in pending:
+            try:
+                payload = self.verify_license(
+                    license_token, module_name, odoo_version, db_uuid, domain
+                )
+            except LicenseVerificationError as e:
+                results.append((None, e))
+            else:
+                results.append((payload, None))
+        
+        return results
+
+
+_VERIFIER_CACHE: Dict[Tuple[str, str], LicenseVerifier] = {}
+
+
+def get_verifier(
+    public_key_path: str,
+    expected_issuer: str = "https://license.biz4a.com"
+) -> LicenseVerifier:
+    """
+    Return the process-wide verifier for a public key.
+    
+    The key is reloaded when the key file's modification time changes,
+    so a rotated key is picked up without restarting the process.
+    """
+    cache_key = (public_key_path, expected_issuer)
+    verifier = _VERIFIER_CACHE.get(cache_key)
+    if verifier is None:
+        verifier = _VERIFIER_CACHE[cache_key] = LicenseVerifier(public_key_path, expected_issuer)
+    else:
+        verifier.reload_public_key()
+    return verifier
+
+
 # POC Testing / Demo
 if __name__ == "__main__":
+    import asyncio
     import sys
     from pathlib import Path
     
@@ -269,22 +698,61 @@ if __name__ == "__main__":
         }
     ]
     
-    for i, test in enumerate(test_cases, 1):
+    def read_token(license_path: Path) -> Optional[str]:
+        if not license_path.exists():
+            return None
+        return license_path.read_text().strip()
+    
+    async def verify_case(test: Dict[str, Any], reads: Dict[Path, "asyncio.Future"]):
+        # Several test cases share a license file; read each one once
+        license_path = Path(test["license_file"])
+        read = reads.get(license_path)
+        if read is None:
+            read = reads[license_path] = asyncio.ensure_future(
+                asyncio.to_thread(read_token, license_path)
+            )
+        license_token = await read
+        if license_token is None:
+            return None
+        
+        # Verify first so the verified payload can be reused for display;
+        # only rejected tokens are decoded a second time.
+        try:
+            result = await asyncio.to_thread(
+                verifier.verify_license,
+                license_token,
+                module_name=test["module"],
+                odoo_version=test["version"],
+                instance_db_uuid=test.get("db_uuid"),
+                instance_domain=test.get("domain")
+            )
+            return license_token, result, None
+        except LicenseVerificationError as e:
+            return license_token, None, e
+    
+    async def verify_all(cases: List[Dict[str, Any]]):
+        reads: Dict[Path, "asyncio.Future"] = {}
+        return await asyncio.gather(*(verify_case(test, reads) for test in cases))
+    
+    # File reads and verifications overlap on worker threads; the report
+    # below is still printed in test order.
+    outcomes = asyncio.run(verify_all(test_cases))
+    
+    for i, (test, outcome) in enumerate(zip(test_cases, outcomes), 1):
         print(f"\n{'='*70}")
         print(f"Test {i}: {test['name']}")
         print(f"{'='*70}")
         
-        # Load license token
-        license_path = Path(test["license_file"])
-        if not license_path.exists():
-            print(f"⚠️  License file not found: {license_path}")
+        if outcome is None:
+            print(f"⚠️  License file not found: {Path(test['license_file'])}")
             continue
-        
-        with open(license_path, "r") as f:
-            license_token = f.read().strip()
+        license_token, result, error = outcome
         
         # Display license info
-        info = verifier.get_license_info(license_token)
+        if result is not None:
+            info = verifier.get_license_info_from_payload(result)
+        else:
+            info = verifier.get_license_info(license_token)
         print(f"\n📋 License Info:")
         print(f"   Customer: {info.get('customer', {}).get('name')}")
         print(f"   Type: {info.get('license_type')}")
@@ -297,25 +765,17 @@ if __name__ == "__main__":
         print(f"   Module: {test['module']}")
         print(f"   Odoo Version: {test['version']}")
         
-        try:
-            result = verifier.verify_license(
-                license_token,
-                module_name=test["module"],
-                odoo_version=test["version"],
-                instance_db_uuid=test.get("db_uuid"),
-                instance_domain=test.get("domain")
-            )
-            
+        if error is None:
             if test["should_pass"]:
                 print(f"   ✅ PASS - License verified successfully")
             else:
                 print(f"   ❌ FAIL - Expected verification to fail, but it passed")
         
-        except LicenseVerificationError as e:
+        else:
             if not test["should_pass"]:
-                print(f"   ✅ PASS - Correctly rejected: {e}")
+                print(f"   ✅ PASS - Correctly rejected: {error}")
             else:
-                print(f"   ❌ FAIL - Unexpected rejection: {e}")
+                print(f"   ❌ FAIL - Unexpected rejection: {error}")
     
     print(f"\n{'='*70}")
     print("✅ Verification tests completed")
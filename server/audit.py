@@ -0,0 +1,134 @@
+"""
+AEGIS License Server - Audit Log Writer
+Batches audit log inserts off the request path.
+"""
+
+import asyncio
+from typing import Any, Optional
+
+import structlog
+from sqlalchemy import insert
+
+from .database import AsyncSessionLocal
+from .models import AuditLog
+
+logger = structlog.get_logger()
+
+
+class AuditLogWriter:
+    """
+    Background writer for audit log entries.
+    
+    Request handlers queue rows with ``enqueue()`` and return immediately.
+    A background task collects up to ``batch_size`` rows, or whatever
+    arrived within ``flush_interval`` seconds of the first one, and writes
+    them as a single multi-row INSERT in its own transaction.
+    
+    A failed batch is retried once, then written one row per transaction,
+    so a single bad row cannot drop the rest. Rows that still fail are
+    logged in full.
+    
+    Trade-off: audit rows are committed after, not with, the change they
+    record. Rows still queued when a worker is killed (rather than shut
+    down through the lifespan, which drains the queue) are lost.
+    """
+    
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 0.1,
+        retry_delay: float = 0.5,
+    ):
+        """
+        Initialize the writer.
+        
+        Args:
+            batch_size: Max rows per INSERT
+            flush_interval: Max seconds a row waits for a batch to fill
+            retry_delay: Seconds to wait before retrying a failed batch
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_delay = retry_delay
+        self._queue: "asyncio.Queue[Optional[dict[str, Any]]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+    
+    def enqueue(self, **values: Any) -> None:
+        """Queue one audit log row (AuditLog column names as keywords)."""
+        self._queue.put_nowait(values)
+    
+    def start(self) -> None:
+        """Start the background flusher (call from the running event loop)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Write out everything still queued, then stop the flusher."""
+        if self._task is not None:
+            self._queue.put_nowait(None)
+            await self._task
+            self._task = None
+    
+    async def _run(self) -> None:
+        """Drain the queue in batches until the stop sentinel arrives."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        
+        while not stopping:
+            row = await self._queue.get()
+            if row is None:
+                return
+            
+            batch = [row]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+            
+            await self._flush(batch)
+    
+    async def _flush(self, batch: list[dict[str, Any]]) -> None:
+        """Insert one batch, retrying and then falling back to single rows; never raises."""
+        try:
+            await self._insert(batch)
+            return
+        except Exception as exc:
+            logger.warning(
+                "Audit log batch insert failed, retrying", count=len(batch), error=str(exc)
+            )
+        
+        await asyncio.sleep(self.retry_delay)
+        try:
+            await self._insert(batch)
+            return
+        except Exception as exc:
+            logger.warning(
+                "Audit log batch retry failed, writing rows one by one",
+                count=len(batch),
+                error=str(exc),
+            )
+        
+        for row in batch:
+            try:
+                await self._insert([row])
+            except Exception as exc:
+                logger.error("Failed to write audit log", audit_row=row, error=str(exc))
+    
+    async def _insert(self, rows: list[dict[str, Any]]) -> None:
+        """Insert rows in a single transaction."""
+        async with AsyncSessionLocal() as session:
+            await session.execute(insert(AuditLog), rows)
+            await session.commit()
+
+
+# Global writer instance (started and stopped by the app lifespan)
+audit_writer = AuditLogWriter()
@@ -43,8 +43,13 @@ class Settings(BaseSettings):
         description="PostgreSQL connection URL"
     )
     db_echo: bool = Field(default=False, description="Echo SQL queries")
-    db_pool_size: int = Field(default=5, description="Database connection pool size")
-    db_max_overflow: int = Field(default=10, description="Max overflow connections")
+    db_pool_size: int = Field(default=20, description="Database connection pool size")
+    db_max_overflow: int = Field(default=40, description="Max overflow connections")
+    db_pool_pre_ping: bool = Field(default=False, description="Ping connections on checkout (one extra round-trip)")
+    db_pool_recycle: int = Field(default=1800, description="Recycle pooled connections after N seconds")
+    db_statement_cache_size: int = Field(default=1024, description="asyncpg per-connection statement cache size")
+    db_prepared_statement_cache_size: int = Field(default=512, description="SQLAlchemy asyncpg prepared statement cache size")
+    db_query_cache_size: int = Field(default=1200, description="SQLAlchemy compiled SQL cache size")
     
     # ===== Security - Signing Keys =====
     private_key_path: Path = Field(
@@ -79,11 +84,29 @@ class Settings(BaseSettings):
         default=30,
         description="Default demo license duration"
     )
+    compact_jti: bool = Field(
+        default=False,
+        description="Encode the JWT 'jti' as 22-char base64url UUID bytes (clients must support it)"
+    )
     
     # ===== Rate Limiting =====
     rate_limit_enabled: bool = Field(default=True, description="Enable rate limiting")
     rate_limit_requests: int = Field(default=100, description="Max requests per minute")
     
+    # ===== Caching =====
+    stats_cache_ttl_seconds: int = Field(
+        default=30,
+        description="How long /admin/stats results are cached in-process (0 disables)"
+    )
+    validation_cache_ttl_seconds: int = Field(
+        default=60,
+        description="Max seconds a verified token signature is reused by /licenses/validate per worker (0 disables)"
+    )
+    validation_cache_max_entries: int = Field(
+        default=10000,
+        description="Max cached verified tokens per worker"
+    )
+    
     # ===== CORS =====
     cors_enabled: bool = Field(default=True, description="Enable CORS")
     cors_origins: list[str] = Field(
@@ -94,6 +117,12 @@ class Settings(BaseSettings):
     # ===== Logging =====
     log_level: str = Field(default="INFO", description="Logging level")
     log_format: str = Field(default="json", description="Log format: json or text")
+    log_sample_rate: float = Field(
+        default=1.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of requests whose access logs are written (5xx always logged)"
+    )
     
     @validator("private_key_path", "public_key_path")
     def validate_key_paths(cls, v: Path) -> Path:
@@ -103,15 +132,20 @@ class Settings(BaseSettings):
             return Path(__file__).parent.parent / v
         return v
     
+    @validator("environment")
+    def normalize_environment(cls, v: str) -> str:
+        """Lowercase the environment name once so checks are plain comparisons."""
+        return v.lower()
+    
     @property
     def is_development(self) -> bool:
         """Check if running in development mode."""
-        return self.environment.lower() == "development"
+        return self.environment == "development"
     
     @property
     def is_production(self) -> bool:
         """Check if running in production mode."""
-        return self.environment.lower() == "production"
+        return self.environment == "production"
     
     def get_database_url_sync(self) -> str:
         """Get synchronous database URL (for Alembic)."""
@@ -5,6 +5,7 @@ SQLAlchemy 2.0 async engine and session management.
 
 from typing import AsyncGenerator
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
@@ -22,7 +23,17 @@ engine = create_async_engine(
     echo=settings.db_echo,
     pool_size=settings.db_pool_size,
     max_overflow=settings.db_max_overflow,
-    pool_pre_ping=True,  # Verify connections before using
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_use_lifo=True,  # Reuse warm connections; idle extras age out via recycle
+    pool_recycle=settings.db_pool_recycle,
+    query_cache_size=settings.db_query_cache_size,
+    connect_args={
+        # Reuse parsed/planned statements across requests on each connection
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        # JIT only adds compile time to short OLTP queries
+        "server_settings": {"jit": "off"},
+    },
     # Use NullPool for serverless/lambda deployments if needed
     # poolclass=NullPool if settings.is_production else None,
 )
@@ -46,13 +57,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         async def handler(db: AsyncSession = Depends(get_db)):
             ...
     
+    The session is never committed here: write endpoints call
+    ``await db.commit()`` themselves, so read-only requests skip the COMMIT.
+    
     Yields:
         AsyncSession: Database session
     """
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -71,6 +84,12 @@ async def init_db() -> None:
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def warm_db() -> None:
+    """Open a pooled connection up front so the first request does not pay for it."""
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
 async def dispose_db() -> None:
     """Dispose database engine and cleanup connections."""
     await engine.dispose()
@@ -3,18 +3,22 @@ AEGIS License Server - Main Application
 FastAPI application with all routes and middleware.
 """
 
+import random
+import secrets
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, Request, Response, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.openapi.utils import get_openapi
+import orjson
 import structlog
 
+from .audit import audit_writer
 from .config import settings
-from .database import init_db, dispose_db
+from .database import init_db, dispose_db, warm_db
 from .routers import licenses, customers, health, admin
 
 
@@ -50,10 +54,26 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         logger.info("Initializing database (development mode)")
         await init_db()
     
+    # Start the batched audit log writer
+    audit_writer.start()
+    
+    # Pre-warm the connection pool and the statistics cache so the first
+    # requests do not pay for connecting or for the stats queries
+    try:
+        await warm_db()
+        await admin.refresh_statistics()
+    except Exception as exc:
+        logger.warning("Could not pre-warm database", error=str(exc))
+    
+    # Build the (cached) OpenAPI schema now rather than on the first /docs visit
+    if app.openapi_url:
+        app.openapi()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down AEGIS License Server")
+    await audit_writer.stop()
     await dispose_db()
 
 
@@ -75,6 +95,7 @@ This API allows authorized systems to:
 **Security:** All licenses are cryptographically signed with Ed25519
     """,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if not settings.is_production else None,
     redoc_url="/redoc" if not settings.is_production else None,
     openapi_url="/openapi.json" if not settings.is_production else None,
@@ -94,43 +115,38 @@ if settings.cors_enabled:
     )
 
 
-# Request ID middleware
+# Request ID + logging middleware (one middleware keeps a single call_next hop per request)
 @app.middleware("http")
-async def add_request_id(request: Request, call_next):
-    """Add unique request ID to each request."""
-    import uuid
-    request_id = str(uuid.uuid4())
+async def observability_mw(request: Request, call_next):
+    """Tag each request with a unique ID and log its start and completion."""
+    request_id = secrets.token_hex(8)
+    sampled = settings.log_sample_rate >= 1.0 or random.random() < settings.log_sample_rate
     
     # Bind request ID to structlog context
-    with structlog.contextvars.bind_contextvars(request_id=request_id):
+    with structlog.contextvars.bound_contextvars(request_id=request_id):
+        if sampled:
+            logger.info(
+                "Request started",
+                method=request.method,
+                path=request.url.path,
+                client=request.client.host if request.client else None,
+            )
+        
         response = await call_next(request)
+        
+        # Server errors are always logged, whatever the sample rate
+        if sampled or response.status_code >= 500:
+            logger.info(
+                "Request completed",
+                method=request.method,
+                path=request.url.path,
+                status_code=response.status_code,
+            )
+        
         response.headers["X-Request-ID"] = request_id
         return response
 
 
-# Logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all HTTP requests."""
-    logger.info(
-        "Request started",
-        method=request.method,
-        path=request.url.path,
-        client=request.client.host if request.client else None,
-    )
-    
-    response = await call_next(request)
-    
-    logger.info(
-        "Request completed",
-        method=request.method,
-        path=request.url.path,
-        status_code=response.status_code,
-    )
-    
-    return response
-
-
 # ===== Exception Handlers =====
 
 @app.exception_handler(RequestValidationError)
@@ -143,7 +159,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
             "message": error["msg"],
         })
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={
             "error": "Validation Error",
@@ -164,7 +180,7 @@ async def global_exception_handler(request: Request, exc: Exception):
     
     # Don't expose internal errors in production
     if settings.is_production:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 "error": "Internal Server Error",
@@ -172,7 +188,7 @@ async def global_exception_handler(request: Request, exc: Exception):
             },
         )
     else:
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             content={
                 "error": "Internal Server Error",
@@ -222,12 +238,30 @@ def custom_openapi():
                     operation["security"] = [{"ApiKeyAuth": []}]
     
     app.openapi_schema = openapi_schema
+    app.state.openapi_bytes = orjson.dumps(openapi_schema)
     return app.openapi_schema
 
 
 app.openapi = custom_openapi
 
 
+async def openapi_json(request: Request) -> Response:
+    """Serve the OpenAPI schema from pre-serialized bytes."""
+    if not app.openapi_schema:
+        app.openapi()
+    return Response(content=request.app.state.openapi_bytes, media_type="application/json")
+
+
+# Swap FastAPI's default /openapi.json route (which re-encodes the dict
+# on every hit) for one that returns the cached bytes
+if app.openapi_url:
+    app.router.routes[:] = [
+        route for route in app.router.routes
+        if getattr(route, "path", None) != app.openapi_url
+    ]
+    app.add_route(app.openapi_url, openapi_json, include_in_schema=False)
+
+
 # ===== Root Endpoint =====
 
 @app.get("/", include_in_schema=False)
@@ -3,19 +3,24 @@ AEGIS License Server - Database Models
 SQLAlchemy 2.0 ORM models for licenses, customers, and audit logs.
 """
 
+import os
+import time
+import uuid
 from datetime import datetime
 from typing import Optional
-from uuid import uuid4
 
-from sqlalchemy import String, DateTime, Boolean, Text, Enum as SQLEnum, Integer, ForeignKey
+from sqlalchemy import String, DateTime, Boolean, Text, Enum as SQLEnum, Integer, SmallInteger, BigInteger, ForeignKey, Index, func, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 import enum
 
 
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
-    pass
+    
+    # Fetch server-generated values (created_at, updated_at, ...) with
+    # INSERT/UPDATE ... RETURNING instead of a follow-up SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class LicenseType(str, enum.Enum):
@@ -33,6 +38,25 @@ class LicenseStatus(str, enum.Enum):
     SUSPENDED = "suspended"
 
 
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUIDv7 (RFC 9562).
+    
+    The 48-bit millisecond timestamp prefix keeps new primary keys at the
+    tail of the B-tree index instead of scattering inserts like uuid4.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    value = (
+        (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76                              # version
+        | (rand >> 68) << 64                     # rand_a (12 bits)
+        | 0b10 << 62                             # variant
+        | rand & 0x3FFF_FFFF_FFFF_FFFF           # rand_b (62 bits)
+    )
+    return uuid.UUID(int=value)
+
+
 # ===== Models =====
 
 class Customer(Base):
@@ -43,8 +67,11 @@ class Customer(Base):
     """
     __tablename__ = "customers"
     
-    # Primary Key
-    id: Mapped[str] = mapped_column(String(50), primary_key=True, index=True)
+    # Primary Key (internal surrogate; joins and FKs compare 8-byte ints)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    
+    # Public identifier exposed through the API and signed into licenses
+    public_id: Mapped[str] = mapped_column(String(50), nullable=False, unique=True, index=True)
     
     # Basic Information
     name: Mapped[str] = mapped_column(String(200), nullable=False)
@@ -60,11 +87,13 @@ class Customer(Base):
     
     # Metadata
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, 
-        default=datetime.utcnow, 
-        onupdate=datetime.utcnow,
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False
     )
     
@@ -76,7 +105,7 @@ class Customer(Base):
     )
     
     def __repr__(self) -> str:
-        return f"<Customer(id={self.id}, name={self.name})>"
+        return f"<Customer(id={self.public_id}, name={self.name})>"
 
 
 class License(Base):
@@ -86,21 +115,37 @@ class License(Base):
     Stores issued licenses with their signed JWT tokens.
     """
     __tablename__ = "licenses"
+    __table_args__ = (
+        # Backs the active-license counts (enum values are stored by name)
+        Index("ix_licenses_status_active", "id", postgresql_where=text("status = 'ACTIVE'")),
+        # Backs per-type counts broken down by status
+        Index("ix_licenses_type_status", "license_type", "status"),
+        # list_licenses filters: customer (+ module), active licenses per customer,
+        # and the small non-active (revoked/expired/suspended) remainder
+        Index("ix_licenses_customer_module", "customer_id", "module_name"),
+        Index("ix_licenses_customer_active", "customer_id", postgresql_where=text("status = 'ACTIVE'")),
+        Index("ix_licenses_status_inactive", "status", postgresql_where=text("status <> 'ACTIVE'")),
+        # Containment lookups such as "allowed_major_versions @> ARRAY[18]"
+        Index(
+            "ix_licenses_allowed_major_versions",
+            "allowed_major_versions",
+            postgresql_using="gin",
+        ),
+    )
     
     # Primary Key
     id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True), 
         primary_key=True, 
-        default=uuid4,
+        default=uuid7,
         index=True
     )
     
     # Foreign Keys
-    customer_id: Mapped[str] = mapped_column(
-        String(50), 
+    customer_id: Mapped[int] = mapped_column(
+        BigInteger,
         ForeignKey("customers.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
     )
     
     # License Details
@@ -112,14 +157,16 @@ class License(Base):
     )
     
     # Versions
-    allowed_major_versions: Mapped[str] = mapped_column(
-        String(200), 
+    allowed_major_versions: Mapped[list[int]] = mapped_column(
+        ARRAY(SmallInteger),
         nullable=False,
-        comment="Comma-separated list of allowed Odoo major versions (e.g., '17,18')"
+        comment="Allowed Odoo major versions (e.g., {17,18})"
     )
     
     # Dates
-    issued_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    issued_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
     expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
     
     # Status
@@ -127,7 +174,6 @@ class License(Base):
         SQLEnum(LicenseStatus, name="license_status_enum"),
         default=LicenseStatus.ACTIVE,
         nullable=False,
-        index=True
     )
     revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     revoked_reason: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -156,11 +202,13 @@ class License(Base):
     
     # Metadata
     notes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False
     )
     
@@ -187,9 +235,9 @@ class License(Base):
         return True
     
     @property
-    def allowed_versions_list(self) -> list[str]:
-        """Get allowed versions as a list."""
-        return [v.strip() for v in self.allowed_major_versions.split(",")]
+    def customer_public_id(self) -> str:
+        """Public ID of the owning customer (requires `customer` to be loaded)."""
+        return self.customer.public_id
 
 
 class AuditLog(Base):
@@ -199,6 +247,10 @@ class AuditLog(Base):
     Tracks all license-related events for security and compliance.
     """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Keyset pagination of /admin/audit-logs on (created_at, id)
+        Index("ix_audit_logs_created_at_id", "created_at", "id"),
+    )
     
     # Primary Key
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -234,10 +286,9 @@ class AuditLog(Base):
     
     # Timestamp
     created_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
-        nullable=False,
-        index=True
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
     )
     
     # Relationships
@@ -289,7 +340,9 @@ class APIKey(Base):
     expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Metadata
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
     created_by: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     
     def __repr__(self) -> str:
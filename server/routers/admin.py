@@ -3,65 +3,101 @@ AEGIS License Server - Admin Router
 Administrative endpoints for monitoring and maintenance.
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import select, func
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+import orjson
+from sqlalchemy import select, func, literal_column, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
-from ..models import License, Customer, AuditLog, LicenseStatus
+from ..config import settings
+from ..database import AsyncSessionLocal, get_db
+from ..models import License, Customer, AuditLog, LicenseStatus, LicenseType
+from ..schemas import AuditLogCursor, AuditLogPage, AuditLogResponse
 
 router = APIRouter()
 
+# Last computed statistics as (monotonic expiry, payload)
+_stats_cache: Optional[Tuple[float, dict]] = None
+
+
+# The audit log total is display-only and the table only grows, so it comes
+# from the planner's row estimate (pg_class.reltuples) instead of a full scan.
+# reltuples is -1 until the table is first analyzed; fall back to count(*) then.
+_AUDIT_LOG_ESTIMATE = literal_column(
+    "(SELECT CASE WHEN reltuples >= 0 THEN reltuples::bigint"
+    " ELSE (SELECT count(*) FROM audit_logs) END"
+    " FROM pg_class WHERE oid = 'audit_logs'::regclass)"
+)
+
+# One pass per table using conditional aggregation (COUNT(*) FILTER ...).
+# Customer and license totals stay exact: they come from the same scan as
+# the filtered counts, so an estimate would not save any work.
+_CUSTOMER_COUNTS = select(
+    func.count().label("total"),
+    func.count().filter(Customer.is_active == True).label("active"),
+    _AUDIT_LOG_ESTIMATE.label("audit_logs"),
+).select_from(Customer)
+
+_LICENSE_COUNTS = select(
+    func.count().label("total"),
+    func.count().filter(License.status == LicenseStatus.ACTIVE).label("active"),
+    func.count().filter(License.status == LicenseStatus.REVOKED).label("revoked"),
+    func.count().filter(License.license_type == LicenseType.PERPETUAL).label("perpetual"),
+    func.count().filter(License.license_type == LicenseType.SUBSCRIPTION).label("subscription"),
+    func.count().filter(License.license_type == LicenseType.DEMO).label("demo"),
+).select_from(License)
+
+
+async def _fetch_one(statement):
+    """Run a single-row query on its own session (so several can run concurrently)."""
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(statement)).one()
+
+
+async def refresh_statistics() -> dict:
+    """Recompute the statistics and store them in the in-process cache."""
+    global _stats_cache
+    stats = await _compute_statistics()
+    if settings.stats_cache_ttl_seconds > 0:
+        _stats_cache = (time.monotonic() + settings.stats_cache_ttl_seconds, stats)
+    return stats
+
 
 @router.get("/stats")
-async def get_statistics(db: AsyncSession = Depends(get_db)):
+async def get_statistics():
     """
     Get server statistics.
     
-    Returns counts of customers, licenses, and other metrics.
+    Returns counts of customers, licenses, and other metrics. Results are
+    cached in-process for ``stats_cache_ttl_seconds``.
     """
-    # Count customers
-    result = await db.execute(select(func.count()).select_from(Customer))
-    total_customers = result.scalar()
-    
-    result = await db.execute(
-        select(func.count()).select_from(Customer).where(Customer.is_active == True)
-    )
-    active_customers = result.scalar()
-    
-    # Count licenses
-    result = await db.execute(select(func.count()).select_from(License))
-    total_licenses = result.scalar()
-    
-    result = await db.execute(
-        select(func.count()).select_from(License).where(License.status == LicenseStatus.ACTIVE)
-    )
-    active_licenses = result.scalar()
-    
-    result = await db.execute(
-        select(func.count()).select_from(License).where(License.status == LicenseStatus.REVOKED)
-    )
-    revoked_licenses = result.scalar()
-    
-    # Count by license type
-    perpetual_result = await db.execute(
-        select(func.count()).select_from(License).where(License.license_type == "perpetual")
-    )
-    perpetual_licenses = perpetual_result.scalar()
-    
-    subscription_result = await db.execute(
-        select(func.count()).select_from(License).where(License.license_type == "subscription")
-    )
-    subscription_licenses = subscription_result.scalar()
-    
-    demo_result = await db.execute(
-        select(func.count()).select_from(License).where(License.license_type == "demo")
+    cached = _stats_cache
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+    return await refresh_statistics()
+
+
+async def _compute_statistics() -> dict:
+    # The two aggregates are independent: run them on separate pooled connections
+    customer_counts, license_counts = await asyncio.gather(
+        _fetch_one(_CUSTOMER_COUNTS),
+        _fetch_one(_LICENSE_COUNTS),
     )
-    demo_licenses = demo_result.scalar()
+    total_customers = customer_counts.total
+    active_customers = customer_counts.active
+    total_audit_logs = customer_counts.audit_logs
     
-    # Recent audit logs count
-    result = await db.execute(select(func.count()).select_from(AuditLog))
-    total_audit_logs = result.scalar()
+    total_licenses = license_counts.total
+    active_licenses = license_counts.active
+    revoked_licenses = license_counts.revoked
+    perpetual_licenses = license_counts.perpetual
+    subscription_licenses = license_counts.subscription
+    demo_licenses = license_counts.demo
     
     return {
         "customers": {
@@ -81,38 +117,77 @@ async def get_statistics(db: AsyncSession = Depends(get_db)):
         },
         "audit_logs": {
             "total": total_audit_logs,
+            "total_is_estimate": True,
         },
     }
 
 
-@router.get("/audit-logs")
+@router.get("/audit-logs", response_model=AuditLogPage)
 async def get_audit_logs(
-    skip: int = 0,
-    limit: int = 100,
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get recent audit logs.
     
-    Returns the most recent license-related events.
+    Returns the most recent license-related events, newest first. Pages are
+    keyset-paginated on (created_at, id): pass the ``next_cursor`` values of
+    a response as ``before_created_at`` and ``before_id`` to get the next
+    page. Both must be given together.
     """
+    if (before_created_at is None) != (before_id is None):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="before_created_at and before_id must be provided together"
+        )
+    
+    query = select(AuditLog)
+    if before_created_at is not None:
+        query = query.where(
+            tuple_(AuditLog.created_at, AuditLog.id) < tuple_(before_created_at, before_id)
+        )
     result = await db.execute(
-        select(AuditLog)
-        .order_by(AuditLog.created_at.desc())
-        .offset(skip)
+        query
+        .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
         .limit(limit)
     )
     logs = result.scalars().all()
     
-    return [
-        {
-            "id": log.id,
-            "event_type": log.event_type,
-            "license_id": str(log.license_id) if log.license_id else None,
-            "customer_id": log.customer_id,
-            "module_name": log.module_name,
-            "event_data": log.event_data,
-            "created_at": log.created_at,
-        }
-        for log in logs
-    ]
+    next_cursor = None
+    if len(logs) == limit and logs:
+        next_cursor = AuditLogCursor(
+            before_created_at=logs[-1].created_at,
+            before_id=logs[-1].id,
+        )
+    
+    return AuditLogPage.model_validate({"items": logs, "next_cursor": next_cursor})
+
+
+@router.get("/audit-logs/export")
+async def export_audit_logs(
+    limit: int = Query(10000, ge=1, le=100000),
+):
+    """
+    Export recent audit logs as NDJSON, newest first.
+    
+    Rows are read through a server-side cursor and written out as they
+    arrive, so memory stays flat however many rows are exported.
+    """
+    query = (
+        select(AuditLog)
+        .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        .limit(limit)
+        .execution_options(yield_per=500)
+    )
+    
+    async def generate():
+        # The request-scoped session may be closed before the body is sent,
+        # so the stream owns its session
+        async with AsyncSessionLocal() as session:
+            result = await session.stream_scalars(query)
+            async for log in result:
+                yield orjson.dumps(AuditLogResponse.model_validate(log).model_dump()) + b"\n"
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
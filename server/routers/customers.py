@@ -3,16 +3,26 @@ AEGIS License Server - Customers Router
 CRUD operations for customer management.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..database import get_db
 from ..models import Customer
-from ..schemas import CustomerCreate, CustomerUpdate, CustomerResponse
+from ..schemas import CUSTOMER_LIST_ADAPTER, CustomerCreate, CustomerUpdate, CustomerResponse
 
 router = APIRouter()
 
+# Statements built once; requests only bind parameters
+_SELECT_CUSTOMER = select(Customer).where(Customer.public_id == bindparam("public_id"))
+_LIST_CUSTOMERS = select(Customer).offset(bindparam("skip")).limit(bindparam("limit"))
+_LIST_ACTIVE_CUSTOMERS = (
+    select(Customer)
+    .where(Customer.is_active == True)
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+
 
 @router.post("/customers", response_model=CustomerResponse, status_code=status.HTTP_201_CREATED)
 async def create_customer(
@@ -25,9 +35,7 @@ async def create_customer(
     Customer ID must be unique.
     """
     # Check if customer already exists
-    result = await db.execute(
-        select(Customer).where(Customer.id == customer.id)
-    )
+    result = await db.execute(_SELECT_CUSTOMER, {"public_id": customer.id})
     existing = result.scalar_one_or_none()
     
     if existing:
@@ -37,10 +45,10 @@ async def create_customer(
         )
     
     # Create new customer
-    db_customer = Customer(**customer.model_dump())
+    customer_data = customer.model_dump()
+    db_customer = Customer(public_id=customer_data.pop("id"), **customer_data)
     db.add(db_customer)
     await db.commit()
-    await db.refresh(db_customer)
     
     return db_customer
 
@@ -51,9 +59,7 @@ async def get_customer(
     db: AsyncSession = Depends(get_db),
 ):
     """Get a customer by ID."""
-    result = await db.execute(
-        select(Customer).where(Customer.id == customer_id)
-    )
+    result = await db.execute(_SELECT_CUSTOMER, {"public_id": customer_id})
     customer = result.scalar_one_or_none()
     
     if not customer:
@@ -77,17 +83,14 @@ async def list_customers(
     
     Supports pagination and filtering.
     """
-    query = select(Customer)
-    
-    if active_only:
-        query = query.where(Customer.is_active == True)
-    
-    query = query.offset(skip).limit(limit)
+    query = _LIST_ACTIVE_CUSTOMERS if active_only else _LIST_CUSTOMERS
     
-    result = await db.execute(query)
+    result = await db.execute(query, {"skip": skip, "limit": limit})
     customers = result.scalars().all()
     
-    return customers
+    # Serialize directly; response_model is kept for the OpenAPI schema only
+    customers = CUSTOMER_LIST_ADAPTER.validate_python(customers, from_attributes=True)
+    return Response(content=CUSTOMER_LIST_ADAPTER.dump_json(customers), media_type="application/json")
 
 
 @router.patch("/customers/{customer_id}", response_model=CustomerResponse)
@@ -97,9 +100,7 @@ async def update_customer(
     db: AsyncSession = Depends(get_db),
 ):
     """Update a customer."""
-    result = await db.execute(
-        select(Customer).where(Customer.id == customer_id)
-    )
+    result = await db.execute(_SELECT_CUSTOMER, {"public_id": customer_id})
     customer = result.scalar_one_or_none()
     
     if not customer:
@@ -114,7 +115,6 @@ async def update_customer(
         setattr(customer, field, value)
     
     await db.commit()
-    await db.refresh(customer)
     
     return customer
 
@@ -129,9 +129,7 @@ async def delete_customer(
     
     This will also delete all associated licenses (CASCADE).
     """
-    result = await db.execute(
-        select(Customer).where(Customer.id == customer_id)
-    )
+    result = await db.execute(_SELECT_CUSTOMER, {"public_id": customer_id})
     customer = result.scalar_one_or_none()
     
     if not customer:
@@ -3,31 +3,53 @@ AEGIS License Server - Health Router
 Health check and system info endpoints.
 """
 
-from fastapi import APIRouter, Depends
+import time
+
+from fastapi import APIRouter
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..config import settings
-from ..database import get_db
+from ..database import engine
 from ..schemas import HealthResponse, InfoResponse
 
 router = APIRouter()
 
+# Settings are immutable for the life of the process
+_INFO_RESPONSE = InfoResponse(
+    app_name=settings.app_name,
+    version=settings.app_version,
+    environment=settings.environment,
+    issuer=settings.license_issuer,
+    key_id=settings.key_id,
+)
+
+# Load balancers poll /health constantly; probe the database at most this often
+_HEALTH_PROBE_INTERVAL = 2.0
+
+# Last probe as (monotonic timestamp, database status)
+_last_probe: tuple[float, str] = (float("-inf"), "healthy")
+
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check(db: AsyncSession = Depends(get_db)):
+async def health_check():
     """
     Health check endpoint.
     
     Returns service status and database connectivity.
     No authentication required.
     """
-    # Check database connectivity
-    try:
-        result = await db.execute(text("SELECT 1"))
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"unhealthy: {str(e)}"
+    global _last_probe
+    
+    # Check database connectivity (result reused for a couple of seconds)
+    checked_at, db_status = _last_probe
+    if time.monotonic() - checked_at >= _HEALTH_PROBE_INTERVAL:
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            db_status = "healthy"
+        except Exception as e:
+            db_status = f"unhealthy: {str(e)}"
+        _last_probe = (time.monotonic(), db_status)
     
     return HealthResponse(
         status="healthy" if db_status == "healthy" else "degraded",
@@ -44,10 +66,4 @@ async def server_info():
     
     Returns basic server configuration (non-sensitive).
     """
-    return InfoResponse(
-        app_name=settings.app_name,
-        version=settings.app_version,
-        environment=settings.environment,
-        issuer=settings.license_issuer,
-        key_id=settings.key_id,
-    )
+    return _INFO_RESPONSE
@@ -3,18 +3,27 @@ AEGIS License Server - Licenses Router
 Core license management endpoints.
 """
 
-from datetime import datetime, timezone
-from uuid import uuid4
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy import bindparam, select, func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager, joinedload
 
+from ..audit import audit_writer
+from ..config import settings
 from ..database import get_db
-from ..models import License, Customer, LicenseStatus, AuditLog
+from ..models import License, Customer, LicenseStatus, uuid7
 from ..schemas import (
     LicenseCreate,
+    LicenseBulkCreate,
     LicenseResponse,
     LicenseListResponse,
     LicenseValidationRequest,
@@ -23,12 +32,55 @@ from ..schemas import (
     FingerprintRequest,
     FingerprintResponse,
 )
-from ..services import get_license_service
+from ..services import get_license_service, license_id_from_jti
 import structlog
 
 router = APIRouter()
 logger = structlog.get_logger()
 
+# Statements built once and reused; requests only bind parameters
+_SELECT_CUSTOMER = select(Customer).where(Customer.public_id == bindparam("public_id"))
+# License PK lookups go through db.get() (identity map first) with the customer joined
+_LICENSE_WITH_CUSTOMER = [joinedload(License.customer)]
+# Revocation check reads one column through the primary key index
+_SELECT_LICENSE_STATUS = select(License.status).where(License.id == bindparam("license_id"))
+
+# Signature-verified token payloads per worker: token digest ->
+# (monotonic expiry, payload), oldest first. Only the signature check is
+# skipped on a hit; claims and revocation status are checked on every request.
+_verified_tokens: "OrderedDict[bytes, Tuple[float, dict]]" = OrderedDict()
+
+
+def _verified_token_key(token: str) -> bytes:
+    """Digest of a license token, used as its cache key."""
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def _verified_token_get(key: bytes) -> Optional[dict]:
+    """Return a cached verified payload, or None if missing or expired."""
+    entry = _verified_tokens.get(key)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        del _verified_tokens[key]
+        return None
+    return entry[1]
+
+
+def _verified_token_put(key: bytes, payload: dict) -> None:
+    """Cache a verified payload until the TTL or the license expiry, whichever is first."""
+    ttl = float(settings.validation_cache_ttl_seconds)
+    exp = payload.get("exp")
+    if exp:
+        ttl = min(ttl, exp - time.time())
+    if ttl <= 0:
+        return
+    
+    _verified_tokens[key] = (time.monotonic() + ttl, payload)
+    _verified_tokens.move_to_end(key)
+    while len(_verified_tokens) > settings.validation_cache_max_entries:
+        _verified_tokens.popitem(last=False)
+
 
 @router.post("/licenses", response_model=LicenseResponse, status_code=status.HTTP_201_CREATED)
 async def issue_license(
@@ -42,9 +94,7 @@ async def issue_license(
     The token can be deployed to the customer's Odoo instance.
     """
     # Verify customer exists
-    result = await db.execute(
-        select(Customer).where(Customer.id == license_data.customer_id)
-    )
+    result = await db.execute(_SELECT_CUSTOMER, {"public_id": license_data.customer_id})
     customer = result.scalar_one_or_none()
     
     if not customer:
@@ -62,15 +112,17 @@ async def issue_license(
             )
     
     # Generate license ID
-    license_id = uuid4()
+    license_id = uuid7()
     
     # Get license service and issue JWT
     license_service = get_license_service()
     
     try:
-        token = license_service.issue_license(
+        # Signing is CPU-bound; keep it off the event loop
+        token = await asyncio.to_thread(
+            license_service.issue_license,
             license_id=license_id,
-            customer_id=customer.id,
+            customer_id=customer.public_id,
             customer_name=customer.name,
             module_name=license_data.module_name,
             allowed_versions=license_data.allowed_major_versions,
@@ -88,16 +140,15 @@ async def issue_license(
     # Calculate expiration date
     expires_at = None
     if license_data.duration_days:
-        from datetime import timedelta
         expires_at = datetime.now(timezone.utc) + timedelta(days=license_data.duration_days)
     
     # Create license record
     db_license = License(
         id=license_id,
-        customer_id=customer.id,
+        customer=customer,
         module_name=license_data.module_name,
         license_type=license_data.license_type,
-        allowed_major_versions=",".join(license_data.allowed_major_versions),
+        allowed_major_versions=sorted({int(v) for v in license_data.allowed_major_versions}),
         issued_at=datetime.now(timezone.utc),
         expires_at=expires_at,
         status=LicenseStatus.ACTIVE,
@@ -109,23 +160,29 @@ async def issue_license(
     
     db.add(db_license)
     
-    # Create audit log
-    audit_log = AuditLog(
+    try:
+        await db.commit()
+    except IntegrityError:
+        # The customer was deleted between the lookup and the insert
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Customer '{license_data.customer_id}' not found. Create customer first.",
+        )
+    
+    # Audit log is written in the background, batched with other events
+    audit_writer.enqueue(
         license_id=license_id,
         event_type="issued",
-        customer_id=customer.id,
+        customer_id=customer.public_id,
         module_name=license_data.module_name,
         event_data=f"License issued: {license_data.license_type}",
     )
-    db.add(audit_log)
-    
-    await db.commit()
-    await db.refresh(db_license)
     
     logger.info(
         "License issued",
         license_id=str(license_id),
-        customer_id=customer.id,
+        customer_id=customer.public_id,
         module=license_data.module_name,
         type=license_data.license_type,
     )
@@ -133,28 +190,119 @@ async def issue_license(
     return db_license
 
 
-@router.get("/licenses/{license_id}", response_model=LicenseResponse)
-async def get_license(
-    license_id: str,
+@router.post("/licenses/bulk", response_model=list[LicenseResponse], status_code=status.HTTP_201_CREATED)
+async def bulk_issue_licenses(
+    bulk_data: LicenseBulkCreate,
     db: AsyncSession = Depends(get_db),
 ):
-    """Get a license by ID."""
-    from uuid import UUID
+    """
+    Issue several signed licenses in one request.
+    
+    Tokens are signed concurrently in worker threads and all records are
+    stored in a single transaction: either every license is created or none.
+    """
+    items = bulk_data.licenses
+    
+    # Validate duration for subscription/demo licenses
+    for index, item in enumerate(items):
+        if item.license_type in ["subscription", "demo"] and not item.duration_days:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"licenses[{index}]: {item.license_type} licenses require duration_days",
+            )
+    
+    # Resolve all customers with one query
+    public_ids = {item.customer_id for item in items}
+    result = await db.execute(select(Customer).where(Customer.public_id.in_(public_ids)))
+    customers = {customer.public_id: customer for customer in result.scalars()}
+    
+    missing = sorted(public_ids - customers.keys())
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Customers not found: {', '.join(missing)}. Create customers first.",
+        )
+    
+    license_service = get_license_service()
+    license_ids = [uuid7() for _ in items]
     
     try:
-        license_uuid = UUID(license_id)
-    except ValueError:
+        # Sign in parallel; the Ed25519 work releases the GIL
+        tokens = await asyncio.gather(*(
+            asyncio.to_thread(
+                license_service.issue_license,
+                license_id=license_id,
+                customer_id=item.customer_id,
+                customer_name=customers[item.customer_id].name,
+                module_name=item.module_name,
+                allowed_versions=item.allowed_major_versions,
+                license_type=item.license_type,
+                duration_days=item.duration_days,
+                instance_fingerprint=item.instance_fingerprint,
+            )
+            for license_id, item in zip(license_ids, items)
+        ))
+    except Exception as e:
+        logger.error("Failed to issue licenses", error=str(e))
         raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Invalid license ID format (must be UUID)",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to sign license: {str(e)}",
         )
     
-    result = await db.execute(
-        select(License)
-        .where(License.id == license_uuid)
-        .options(selectinload(License.customer))
-    )
-    license_obj = result.scalar_one_or_none()
+    # Create license records (flushed as one multi-row INSERT ... RETURNING)
+    now = datetime.now(timezone.utc)
+    db_licenses = [
+        License(
+            id=license_id,
+            customer=customers[item.customer_id],
+            module_name=item.module_name,
+            license_type=item.license_type,
+            allowed_major_versions=sorted({int(v) for v in item.allowed_major_versions}),
+            issued_at=now,
+            expires_at=now + timedelta(days=item.duration_days) if item.duration_days else None,
+            status=LicenseStatus.ACTIVE,
+            instance_fingerprint=item.instance_fingerprint,
+            token=token,
+            key_id=license_service.key_id,
+            notes=item.notes,
+        )
+        for license_id, item, token in zip(license_ids, items, tokens)
+    ]
+    
+    db.add_all(db_licenses)
+    
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A customer was deleted between the lookup and the insert
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="A customer was deleted while issuing licenses. Retry the request.",
+        )
+    
+    # Audit logs are written in the background, batched with other events
+    for license_id, item in zip(license_ids, items):
+        audit_writer.enqueue(
+            license_id=license_id,
+            event_type="issued",
+            customer_id=item.customer_id,
+            module_name=item.module_name,
+            event_data=f"License issued: {item.license_type}",
+        )
+    
+    logger.info("Licenses issued in bulk", count=len(db_licenses))
+    
+    return db_licenses
+
+
+@router.get("/licenses/{license_id}", response_model=LicenseResponse)
+async def get_license(
+    license_id: UUID,
+    db: AsyncSession = Depends(get_db),
+):
+    """Get a license by ID."""
+    license_obj = await db.get(License, license_id, options=_LICENSE_WITH_CUSTOMER)
     
     if not license_obj:
         raise HTTPException(
@@ -178,11 +326,18 @@ async def list_licenses(
     """
     List licenses with filtering and pagination.
     """
-    # Build query
-    query = select(License).options(selectinload(License.customer))
+    # Build query; the total comes back on every row via count(*) OVER ()
+    query = select(License, func.count().over().label("total_count"))
     
     if customer_id:
-        query = query.where(License.customer_id == customer_id)
+        # Filter on the joined customers row and load the relationship from it
+        query = (
+            query.join(License.customer)
+            .where(Customer.public_id == customer_id)
+            .options(contains_eager(License.customer))
+        )
+    else:
+        query = query.options(joinedload(License.customer))
     
     if module_name:
         query = query.where(License.module_name == module_name)
@@ -193,27 +348,41 @@ async def list_licenses(
     if status_filter:
         query = query.where(License.status == status_filter)
     
-    # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total = total_result.scalar()
-    
-    # Apply pagination
-    query = query.offset((page - 1) * page_size).limit(page_size)
+    # Apply pagination (newest first; id breaks ties so pages are stable)
+    query = (
+        query.order_by(License.issued_at.desc(), License.id.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )
     
     # Execute query
     result = await db.execute(query)
-    licenses = result.scalars().all()
+    rows = result.unique().all()
+    licenses = [row.License for row in rows]
+    
+    if rows:
+        total = rows[0].total_count
+    elif page > 1:
+        # Past the last page there is no row to carry the total
+        count_query = select(func.count()).select_from(
+            query.order_by(None).limit(None).offset(None).subquery()
+        )
+        total = (await db.execute(count_query)).scalar()
+    else:
+        total = 0
     
     total_pages = (total + page_size - 1) // page_size
     
-    return LicenseListResponse(
+    page_response = LicenseListResponse(
         licenses=licenses,
         total=total,
         page=page,
         page_size=page_size,
         total_pages=total_pages,
     )
+    
+    # Serialize directly; response_model is kept for the OpenAPI schema only
+    return Response(content=page_response.model_dump_json(), media_type="application/json")
 
 
 @router.post("/licenses/validate", response_model=LicenseValidationResponse)
@@ -232,100 +401,123 @@ async def validate_license(
     - Version compatibility
     - Instance binding (if present)
     """
-    license_service = get_license_service()
-    
     try:
-        # Verify JWT signature
-        payload = license_service.verify_license(validation.token)
-        
-        license_id = payload.get("jti")
-        license_type = payload.get("license_type")
-        customer_name = payload.get("customer", {}).get("name")
-        module = payload.get("module", {})
-        
-        # Check module name
-        if module.get("technical_name") != validation.module_name:
-            return LicenseValidationResponse(
-                valid=False,
-                error=f"License is for module '{module.get('technical_name')}', not '{validation.module_name}'",
-            )
-        
-        # Check Odoo version
-        allowed_versions = module.get("allowed_major_versions", [])
-        if validation.odoo_version not in allowed_versions:
+        return await _validate_license(validation, db)
+    except Exception as e:
+        logger.error("License validation failed", error=str(e))
+        return LicenseValidationResponse(
+            valid=False,
+            error=f"Validation error: {str(e)}",
+        )
+
+
+async def _validate_license(
+    validation: LicenseValidationRequest,
+    db: AsyncSession,
+) -> LicenseValidationResponse:
+    """Run the validation checks for a token."""
+    key = _verified_token_key(validation.token)
+    payload = _verified_token_get(key)
+    if payload is None:
+        # Verify JWT signature (CPU-bound, run in a worker thread)
+        license_service = get_license_service()
+        payload = await asyncio.to_thread(license_service.verify_license, validation.token)
+        _verified_token_put(key, payload)
+    
+    # All claim checks are pure; only revocation needs the database
+    failure = _check_claims(payload, validation)
+    if failure is not None:
+        return failure
+    
+    license_uuid = license_id_from_jti(payload["jti"])
+    license_id = str(license_uuid)
+    exp = payload.get("exp")
+    
+    # Check if license is revoked in database
+    result = await db.execute(_SELECT_LICENSE_STATUS, {"license_id": license_uuid})
+    license_status = result.scalar_one_or_none()
+    
+    if license_status == LicenseStatus.REVOKED:
+        return LicenseValidationResponse(
+            valid=False,
+            license_id=license_id,
+            error="License has been revoked",
+        )
+    
+    # All checks passed
+    return LicenseValidationResponse(
+        valid=True,
+        license_id=license_id,
+        license_type=payload.get("license_type"),
+        customer_name=payload.get("customer", {}).get("name"),
+        expires_at=datetime.fromtimestamp(exp, tz=timezone.utc) if exp else None,
+    )
+
+
+def _check_claims(
+    payload: dict,
+    validation: LicenseValidationRequest,
+) -> Optional[LicenseValidationResponse]:
+    """
+    Check module, version, expiration and instance binding (no I/O).
+    
+    Returns:
+        A failed LicenseValidationResponse, or None if all checks pass
+    """
+    module = payload.get("module", {})
+    
+    # Check module name
+    if module.get("technical_name") != validation.module_name:
+        return LicenseValidationResponse(
+            valid=False,
+            error=f"License is for module '{module.get('technical_name')}', not '{validation.module_name}'",
+        )
+    
+    # Check Odoo version
+    allowed_versions = module.get("allowed_major_versions", [])
+    if validation.odoo_version not in allowed_versions:
+        return LicenseValidationResponse(
+            valid=False,
+            error=f"Odoo version '{validation.odoo_version}' not allowed. Allowed: {allowed_versions}",
+        )
+    
+    # Check expiration (integer epoch comparison)
+    exp = payload.get("exp")
+    if exp and time.time() >= exp:
+        return LicenseValidationResponse(
+            valid=False,
+            license_id=str(license_id_from_jti(payload["jti"])),
+            license_type=payload.get("license_type"),
+            error="License has expired",
+            expires_at=datetime.fromtimestamp(exp, tz=timezone.utc),
+        )
+    
+    # Check instance binding if required
+    instance_fp = payload.get("instance_fingerprint")
+    if instance_fp:
+        if not validation.instance_db_uuid or not validation.instance_domain:
             return LicenseValidationResponse(
                 valid=False,
-                error=f"Odoo version '{validation.odoo_version}' not allowed. Allowed: {allowed_versions}",
+                error="License is bound to an instance, but instance details not provided",
             )
         
-        # Check expiration
-        exp = payload.get("exp")
-        if exp:
-            from datetime import datetime, timezone
-            exp_dt = datetime.fromtimestamp(exp, tz=timezone.utc)
-            if datetime.now(timezone.utc) >= exp_dt:
-                return LicenseValidationResponse(
-                    valid=False,
-                    license_id=license_id,
-                    license_type=license_type,
-                    error="License has expired",
-                    expires_at=exp_dt,
-                )
-        
-        # Check instance binding if required
-        instance_fp = payload.get("instance_fingerprint")
-        if instance_fp:
-            if not validation.instance_db_uuid or not validation.instance_domain:
-                return LicenseValidationResponse(
-                    valid=False,
-                    error="License is bound to an instance, but instance details not provided",
-                )
-            
-            computed_fp = license_service.generate_instance_fingerprint(
-                validation.instance_db_uuid,
-                validation.instance_domain,
-            )
-            
-            if instance_fp != computed_fp:
-                return LicenseValidationResponse(
-                    valid=False,
-                    error="Instance fingerprint mismatch. License is bound to a different instance.",
-                )
-        
-        # Check if license is revoked in database
-        from uuid import UUID
-        result = await db.execute(
-            select(License).where(License.id == UUID(license_id))
+        computed_fp = get_license_service().generate_instance_fingerprint(
+            validation.instance_db_uuid,
+            validation.instance_domain,
         )
-        db_license = result.scalar_one_or_none()
         
-        if db_license and db_license.status == LicenseStatus.REVOKED:
+        if instance_fp != computed_fp:
             return LicenseValidationResponse(
                 valid=False,
-                license_id=license_id,
-                error="License has been revoked",
+                error="Instance fingerprint mismatch. License is bound to a different instance.",
             )
-        
-        # All checks passed
-        return LicenseValidationResponse(
-            valid=True,
-            license_id=license_id,
-            license_type=license_type,
-            customer_name=customer_name,
-            expires_at=exp_dt if exp else None,
-        )
     
-    except Exception as e:
-        logger.error("License validation failed", error=str(e))
-        return LicenseValidationResponse(
-            valid=False,
-            error=f"Validation error: {str(e)}",
-        )
+    return None
 
 
 @router.delete("/licenses/{license_id}/revoke")
 async def revoke_license(
-    license_id: str,
+    license_id: UUID,
     revoke_data: LicenseRevoke,
     db: AsyncSession = Depends(get_db),
 ):
@@ -334,20 +526,7 @@ async def revoke_license(
     
     Revoked licenses will fail validation checks.
     """
-    from uuid import UUID
-    
-    try:
-        license_uuid = UUID(license_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="Invalid license ID format",
-        )
-    
-    result = await db.execute(
-        select(License).where(License.id == license_uuid)
-    )
-    license_obj = result.scalar_one_or_none()
+    license_obj = await db.get(License, license_id, options=_LICENSE_WITH_CUSTOMER)
     
     if not license_obj:
         raise HTTPException(
@@ -366,17 +545,16 @@ async def revoke_license(
     license_obj.revoked_at = datetime.now(timezone.utc)
     license_obj.revoked_reason = revoke_data.reason
     
-    # Create audit log
-    audit_log = AuditLog(
-        license_id=license_uuid,
+    await db.commit()
+    
+    # Audit log is written in the background, batched with other events
+    audit_writer.enqueue(
+        license_id=license_id,
         event_type="revoked",
-        customer_id=license_obj.customer_id,
+        customer_id=license_obj.customer_public_id,
         module_name=license_obj.module_name,
         event_data=f"Revoked: {revoke_data.reason}",
     )
-    db.add(audit_log)
-    
-    await db.commit()
     
     logger.info(
         "License revoked",
@@ -3,15 +3,19 @@ AEGIS License Server - API Schemas
 Pydantic models for request/response validation.
 """
 
+import re
 from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, EmailStr, field_validator
+from pydantic import BaseModel, Field, EmailStr, TypeAdapter, field_validator
 
 
 # ===== Customer Schemas =====
 
+# Letters, digits, '-' and '_', with at least one letter or digit
+_CUSTOMER_ID_RE = re.compile(r"[A-Za-z0-9_-]*[A-Za-z0-9][A-Za-z0-9_-]*")
+
 class CustomerBase(BaseModel):
     """Base customer schema with common fields."""
     name: str = Field(..., min_length=1, max_length=200, description="Customer name")
@@ -30,7 +34,7 @@ class CustomerCreate(CustomerBase):
     @classmethod
     def validate_customer_id(cls, v: str) -> str:
         """Validate customer ID format."""
-        if not v.replace("-", "").replace("_", "").isalnum():
+        if not _CUSTOMER_ID_RE.fullmatch(v):
             raise ValueError("Customer ID must be alphanumeric (with optional - or _)")
         return v
 
@@ -48,7 +52,7 @@ class CustomerUpdate(BaseModel):
 
 class CustomerResponse(CustomerBase):
     """Schema for customer response."""
-    id: str
+    id: str = Field(validation_alias="public_id")
     is_active: bool
     created_at: datetime
     updated_at: datetime
@@ -56,6 +60,10 @@ class CustomerResponse(CustomerBase):
     model_config = {"from_attributes": True}
 
 
+# Built once; validates ORM rows and dumps JSON in a single pass
+CUSTOMER_LIST_ADAPTER = TypeAdapter(list[CustomerResponse])
+
+
 # ===== License Schemas =====
 
 class LicenseCreate(BaseModel):
@@ -99,20 +107,33 @@ class LicenseCreate(BaseModel):
     @field_validator("allowed_major_versions")
     @classmethod
     def validate_versions(cls, v: list[str]) -> list[str]:
-        """Validate version format."""
+        """Validate version format (stored as SMALLINT, so 1-32767)."""
         for version in v:
-            if not version.isdigit():
+            # isdigit() alone accepts characters like '²' that int() rejects
+            if not (version.isascii() and version.isdigit()):
                 raise ValueError(f"Version must be a number, got: {version}")
+            if not 0 < int(version) <= 32767:
+                raise ValueError(f"Version must be between 1 and 32767, got: {version}")
         return v
 
 
+class LicenseBulkCreate(BaseModel):
+    """Schema for issuing several licenses in one request."""
+    licenses: list[LicenseCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Licenses to issue (all or nothing)"
+    )
+
+
 class LicenseResponse(BaseModel):
     """Schema for license response."""
     id: UUID
-    customer_id: str
+    customer_id: str = Field(validation_alias="customer_public_id")
     module_name: str
     license_type: str
-    allowed_major_versions: str  # Stored as comma-separated in DB
+    allowed_major_versions: list[int]
     issued_at: datetime
     expires_at: Optional[datetime]
     status: str
@@ -183,6 +204,35 @@ class FingerprintResponse(BaseModel):
     domain: str
 
 
+# ===== Audit Log Schemas =====
+
+class AuditLogResponse(BaseModel):
+    """Schema for an audit log entry."""
+    id: int
+    event_type: str
+    license_id: Optional[UUID]
+    customer_id: Optional[str]
+    module_name: Optional[str]
+    event_data: Optional[str]
+    created_at: datetime
+    
+    model_config = {"from_attributes": True}
+
+
+class AuditLogCursor(BaseModel):
+    """Keyset cursor pointing just past the last entry of a page."""
+    before_created_at: datetime
+    before_id: int
+
+
+class AuditLogPage(BaseModel):
+    """Schema for a keyset-paginated page of audit logs."""
+    items: list[AuditLogResponse]
+    next_cursor: Optional[AuditLogCursor] = Field(
+        None, description="Pass as before_created_at/before_id for the next page; null on the last page"
+    )
+
+
 # ===== Health & Info Schemas =====
 
 class HealthResponse(BaseModel):
@@ -4,18 +4,131 @@ Core business logic for license issuance and verification.
 Reuses cryptographic logic from POC.
 """
 
+import base64
 import hashlib
+import hmac
+import json
 import jwt
-from datetime import datetime, timedelta, timezone
+import orjson
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from uuid import UUID
 
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
 from .config import settings
 
+# License types accepted at issuance, and those that carry an expiry
+_VALID_TYPES = frozenset({"perpetual", "subscription", "demo"})
+_EXPIRING_TYPES = frozenset({"subscription", "demo"})
+
+
+def _version_key(version: str) -> tuple[int, str]:
+    """Sort key putting digit strings in numeric order ('9' before '17')."""
+    return (len(version), version)
+
+
+def _b64url(data: bytes) -> bytes:
+    """Unpadded base64url encoding, as used in JWT segments."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+@lru_cache(maxsize=8)
+def _load_public_key(path: Path, mtime_ns: int):
+    """
+    Load a PEM public key.
+    
+    Cached per (path, mtime), so verification skips the file read and
+    PEM parse while still picking up a replaced key file.
+    """
+    with open(path, "rb") as f:
+        return serialization.load_pem_public_key(f.read())
+
+
+@lru_cache(maxsize=8)
+def _load_private_key_file(path: Path, mtime_ns: int) -> ed25519.Ed25519PrivateKey:
+    """
+    Load and check an Ed25519 private key.
+    
+    Cached like _load_public_key, so services built for the same key
+    file share one parsed key.
+    """
+    with open(path, "rb") as f:
+        private_key = serialization.load_pem_private_key(
+            f.read(),
+            password=None  # TODO: Support encrypted keys in production
+        )
+    
+    if not isinstance(private_key, ed25519.Ed25519PrivateKey):
+        raise ValueError(f"Key at {path} is not an Ed25519 private key")
+    
+    return private_key
+
+
+# Header segments (as sent) that have already passed a full verification
+_ACCEPTED_HEADERS: set[bytes] = set()
+_ACCEPTED_HEADER_KEYS = frozenset({"alg", "kid", "typ"})
+_REQUIRED_CLAIMS = ("jti", "iss", "iat")
+
+
+def _b64url_decode(segment: bytes) -> bytes:
+    """Decode an unpadded base64url JWT segment."""
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+
+def license_id_from_jti(jti: str) -> UUID:
+    """Parse a 'jti' claim in either the UUID string or the compact form."""
+    if len(jti) == 22:
+        return UUID(bytes=_b64url_decode(jti.encode("ascii")))
+    return UUID(jti)
+
+
+def _verify_raw(token: str, public_key) -> Optional[dict]:
+    """
+    Verify an EdDSA JWT without going through PyJWT.
+    
+    Returns the payload only when the token is plainly valid: a known or
+    acceptable header, a good signature, the required claims present and
+    nothing time-sensitive left to check. Returns None otherwise, so the
+    caller can fall back to jwt.decode for the exact error.
+    """
+    try:
+        header_b64, payload_b64, signature_b64 = token.encode("ascii").split(b".")
+    except (UnicodeEncodeError, ValueError):
+        return None
+    
+    try:
+        if header_b64 not in _ACCEPTED_HEADERS:
+            header = orjson.loads(_b64url_decode(header_b64))
+            if (
+                not isinstance(header, dict)
+                or header.get("alg") != "EdDSA"
+                or not header.keys() <= _ACCEPTED_HEADER_KEYS
+            ):
+                return None
+        
+        public_key.verify(_b64url_decode(signature_b64), header_b64 + b"." + payload_b64)
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except (InvalidSignature, ValueError):
+        return None
+    
+    if not isinstance(payload, dict) or "nbf" in payload:
+        return None
+    for claim in _REQUIRED_CLAIMS:
+        if claim not in payload:
+            return None
+    iat = payload["iat"]
+    if type(iat) is not int or iat > time.time():
+        return None
+    
+    _ACCEPTED_HEADERS.add(header_b64)
+    return payload
+
 
 class LicenseService:
     """
@@ -35,30 +148,34 @@ class LicenseService:
         self.private_key_path = private_key_path or settings.private_key_path
         self.key_id = key_id or settings.key_id
         self.issuer = settings.license_issuer
+        self.compact_jti = settings.compact_jti
         
         # Load private key on initialization
         self.private_key = self._load_private_key()
+        self._sign_fn = self.private_key.sign
+        
+        # The JWT header never changes for this key, so encode it once
+        # (same sorted, compact form PyJWT produces)
+        header = {"alg": "EdDSA", "kid": self.key_id, "typ": "JWT"}
+        self._header_b64 = _b64url(
+            json.dumps(header, separators=(",", ":"), sort_keys=True).encode("utf-8")
+        )
+        
+        # Claims that are identical for every license from this service
+        self._payload_template = {"iss": self.issuer}
     
     def _load_private_key(self) -> ed25519.Ed25519PrivateKey:
-        """Load Ed25519 private key from PEM file."""
-        if not self.private_key_path.exists():
+        """Load Ed25519 private key from PEM file (cached per path and mtime)."""
+        path = self.private_key_path.resolve()
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except FileNotFoundError:
             raise FileNotFoundError(
                 f"Private key not found: {self.private_key_path}\n"
                 f"Generate keys using: python scripts/generate_keys.py"
-            )
-        
-        with open(self.private_key_path, "rb") as f:
-            private_key = serialization.load_pem_private_key(
-                f.read(),
-                password=None  # TODO: Support encrypted keys in production
-            )
+            ) from None
         
-        if not isinstance(private_key, ed25519.Ed25519PrivateKey):
-            raise ValueError(
-                f"Key at {self.private_key_path} is not an Ed25519 private key"
-            )
-        
-        return private_key
+        return _load_private_key_file(path, mtime_ns)
     
     def issue_license(
         self,
@@ -90,41 +207,103 @@ class LicenseService:
         Raises:
             ValueError: If parameters are invalid
         """
-        # Validate license type
-        valid_types = ["perpetual", "subscription", "demo"]
-        if license_type not in valid_types:
-            raise ValueError(f"Invalid license_type. Must be one of: {valid_types}")
+        return self.issue_licenses_bulk([{
+            "license_id": license_id,
+            "customer_id": customer_id,
+            "customer_name": customer_name,
+            "module_name": module_name,
+            "allowed_versions": allowed_versions,
+            "license_type": license_type,
+            "duration_days": duration_days,
+            "instance_fingerprint": instance_fingerprint,
+        }])[0]
+    
+    def issue_licenses_bulk(self, licenses: list[dict]) -> list[str]:
+        """
+        Issue several signed license JWTs.
+        
+        The header is pre-encoded and the payloads are signed directly with
+        the loaded Ed25519 key, so per-license cost is one orjson dump and
+        one signature.
+        
+        Args:
+            licenses: One dict of issue_license() keyword arguments per license
+        
+        Returns:
+            Signed JWT license strings, in input order
+        
+        Raises:
+            ValueError: If any license parameters are invalid
+        """
+        issued_at = int(time.time())
+        
+        # Bind hot-loop lookups to locals
+        build_payload = self._build_payload
+        sign_payload = self._sign_payload
+        
+        return [
+            sign_payload(build_payload(issued_at=issued_at, **params))
+            for params in licenses
+        ]
+    
+    def _sign_payload(self, payload: dict) -> str:
+        """
+        Encode and sign one JWT.
         
-        # Current timestamp
-        now = datetime.now(timezone.utc)
-        issued_at = int(now.timestamp())
+        Works on bytes throughout: orjson-encoded payload, cached header
+        segment, Ed25519 signature, one decode at the end.
+        """
+        signing_input = self._header_b64 + b"." + _b64url(orjson.dumps(payload))
+        return (signing_input + b"." + _b64url(self._sign_fn(signing_input))).decode("ascii")
+    
+    def _build_payload(
+        self,
+        issued_at: int,
+        license_id: UUID,
+        customer_id: str,
+        customer_name: str,
+        module_name: str,
+        allowed_versions: list[str],
+        license_type: str,
+        duration_days: Optional[int] = None,
+        instance_fingerprint: Optional[str] = None,
+    ) -> dict:
+        """Validate license parameters and build the JWT claims."""
+        # Validate license type
+        if license_type not in _VALID_TYPES:
+            raise ValueError(
+                f"Invalid license_type. Must be one of: {sorted(_VALID_TYPES)}"
+            )
         
-        # Calculate expiration
+        # Calculate expiration (UTC epoch seconds, so a day is always 86400)
         expires_at = None
-        if license_type in ["subscription", "demo"]:
+        if license_type in _EXPIRING_TYPES:
             if duration_days is None:
                 raise ValueError(f"{license_type} licenses require duration_days")
-            expiry_time = now + timedelta(days=duration_days)
-            expires_at = int(expiry_time.timestamp())
-        
-        # Build JWT payload
-        payload = {
-            # Standard JWT claims
-            "jti": str(license_id),      # JWT ID
-            "iss": self.issuer,           # Issuer
-            "iat": issued_at,             # Issued At
-            
-            # AEGIS-specific claims
-            "customer": {
-                "id": customer_id,
-                "name": customer_name
-            },
-            "module": {
-                "technical_name": module_name,
-                "allowed_major_versions": allowed_versions
-            },
-            "license_type": license_type,
+            expires_at = issued_at + duration_days * 86400
+        
+        # Build JWT payload from the static template (iss)
+        payload = self._payload_template.copy()
+        
+        # Standard JWT claims
+        # JWT ID (compact form: unpadded base64url of the 16 UUID bytes)
+        if self.compact_jti:
+            payload["jti"] = _b64url(license_id.bytes).decode("ascii")
+        else:
+            payload["jti"] = str(license_id)
+        payload["iat"] = issued_at           # Issued At
+        
+        # AEGIS-specific claims
+        payload["customer"] = {
+            "id": customer_id,
+            "name": customer_name
         }
+        payload["module"] = {
+            "technical_name": module_name,
+            # Deduplicated, numeric order: same inputs give identical bytes
+            "allowed_major_versions": sorted(set(allowed_versions), key=_version_key)
+        }
+        payload["license_type"] = license_type
         
         # Add expiration if present
         if expires_at is not None:
@@ -134,15 +313,7 @@ class LicenseService:
         if instance_fingerprint:
             payload["instance_fingerprint"] = instance_fingerprint
         
-        # Sign JWT with Ed25519
-        token = jwt.encode(
-            payload,
-            self.private_key,
-            algorithm="EdDSA",
-            headers={"kid": self.key_id}
-        )
-        
-        return token
+        return payload
     
     def verify_license(self, token: str, public_key_path: Optional[Path] = None) -> dict:
         """
@@ -161,22 +332,59 @@ class LicenseService:
         Raises:
             jwt.InvalidTokenError: If verification fails
         """
-        public_key_path = public_key_path or settings.public_key_path
-        
-        with open(public_key_path, "rb") as f:
-            public_key = serialization.load_pem_public_key(f.read())
-        
-        # Verify signature and decode
-        payload = jwt.decode(
-            token,
-            public_key,
-            algorithms=["EdDSA"],
-            options={
-                "verify_signature": True,
-                "verify_exp": False,  # We handle expiration in business logic
-                "require": ["jti", "iss", "iat"]
-            }
-        )
+        return self._decode(token, self._public_key(public_key_path))
+    
+    def verify_many(
+        self,
+        tokens: list[str],
+        public_key_path: Optional[Path] = None,
+    ) -> list[Optional[dict]]:
+        """
+        Verify several license JWTs against one public key.
+        
+        The key is resolved once for the whole batch; intended for audit
+        sweeps over stored licenses.
+        
+        Args:
+            tokens: JWT license strings
+            public_key_path: Path to public key (defaults to settings)
+        
+        Returns:
+            Decoded payloads in input order, None for each token that
+            fails verification
+        """
+        public_key = self._public_key(public_key_path)
+        decode = self._decode
+        
+        results: list[Optional[dict]] = []
+        for token in tokens:
+            try:
+                results.append(decode(token, public_key))
+            except jwt.InvalidTokenError:
+                results.append(None)
+        return results
+    
+    @staticmethod
+    def _public_key(public_key_path: Optional[Path]):
+        """Return the (cached) public key for a path, defaulting to settings."""
+        public_key_path = (public_key_path or settings.public_key_path).resolve()
+        return _load_public_key(public_key_path, public_key_path.stat().st_mtime_ns)
+    
+    def _decode(self, token: str, public_key) -> dict:
+        """Verify one token against a loaded public key and check the issuer."""
+        # Verify signature and decode; PyJWT handles anything unusual
+        payload = _verify_raw(token, public_key)
+        if payload is None:
+            payload = jwt.decode(
+                token,
+                public_key,
+                algorithms=["EdDSA"],
+                options={
+                    "verify_signature": True,
+                    "verify_exp": False,  # We handle expiration in business logic
+                    "require": ["jti", "iss", "iat"]
+                }
+            )
         
         # Verify issuer
         if payload.get("iss") != self.issuer:
@@ -186,11 +394,54 @@ class LicenseService:
         
         return payload
     
+    def verify_license_with_fingerprint(
+        self,
+        token: str,
+        expected_fp: bytes,
+        public_key_path: Optional[Path] = None,
+    ) -> dict:
+        """
+        Verify a license JWT and its instance binding.
+        
+        The 'instance_fingerprint' claim is compared as raw digest bytes
+        (constant time), so callers checking many tokens against the same
+        instance convert its fingerprint once.
+        
+        Args:
+            token: JWT license string
+            expected_fp: 32-byte SHA-256 digest of the instance
+                (``bytes.fromhex(fingerprint[7:])``)
+            public_key_path: Path to public key (defaults to settings)
+        
+        Returns:
+            Decoded and validated payload
+        
+        Raises:
+            jwt.InvalidTokenError: If verification fails or the license is
+                not bound to this instance
+        """
+        payload = self.verify_license(token, public_key_path)
+        
+        claim = payload.get("instance_fingerprint")
+        if not isinstance(claim, str) or not claim.startswith("sha256:"):
+            raise jwt.InvalidTokenError("License is not bound to an instance")
+        try:
+            digest = bytes.fromhex(claim[7:])
+        except ValueError:
+            raise jwt.InvalidTokenError("Malformed instance fingerprint") from None
+        if not hmac.compare_digest(digest, expected_fp):
+            raise jwt.InvalidTokenError("Instance fingerprint mismatch")
+        
+        return payload
+    
     @staticmethod
+    @lru_cache(maxsize=1024)
     def generate_instance_fingerprint(db_uuid: str, domain: str) -> str:
         """
         Generate an instance fingerprint for license binding.
         
+        Results are memoized: the same Odoo instances validate repeatedly.
+        
         Args:
             db_uuid: Odoo database UUID
             domain: Instance domain name
@@ -198,13 +449,14 @@ class LicenseService:
         Returns:
             SHA-256 fingerprint string (e.g., 'sha256:abc123...')
         """
-        combined = f"{db_uuid}:{domain}".encode('utf-8')
-        hash_obj = hashlib.sha256(combined)
-        return f"sha256:{hash_obj.hexdigest()}"
+        # Same bytes as f"{db_uuid}:{domain}".encode(), without the format step
+        combined = db_uuid.encode("utf-8") + b":" + domain.encode("utf-8")
+        return "sha256:" + hashlib.sha256(combined).hexdigest()
 
 
 # Global service instance (initialized on first import)
 _license_service: Optional[LicenseService] = None
+_license_service_lock = threading.Lock()
 
 
 def get_license_service() -> LicenseService:
@@ -215,5 +467,8 @@ def get_license_service() -> LicenseService:
     """
     global _license_service
     if _license_service is None:
-        _license_service = LicenseService()
+        # Signing runs in worker threads, so two first calls can race
+        with _license_service_lock:
+            if _license_service is None:
+                _license_service = LicenseService()
     return _license_service